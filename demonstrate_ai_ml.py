@@ -4,91 +4,106 @@ AI/ML Components Demonstration
 Shows all implemented machine learning algorithms in the DC Microgrid project
 """
 
+import os
+import sys
 import numpy as np
+import matplotlib
+# Output is written with savefig only, so skip probing interactive backends
+matplotlib.use(os.environ.get('MPLBACKEND', 'Agg'))
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Patch
+from matplotlib.colors import to_rgba
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# Create output directory
-output_dir = Path('results/ai_ml_demo')
-output_dir.mkdir(exist_ok=True, parents=True)
+# Preview resolution by default; --final renders print-grade output
+DPI = 300 if '--final' in sys.argv[1:] else int(os.environ.get('PLOT_DPI', 100))
+
+# Grid styling shared by every panel, configured once instead of per-axes
+plt.rcParams.update({'axes.grid': True, 'grid.alpha': 0.3})
 
-print("="*80)
-print(" "*20 + "AI/ML COMPONENTS IN DC MICROGRID")
-print("="*80)
 
 # ============================================================================
 # 1. FAULT DETECTION - LSTM/CNN Neural Networks
 # ============================================================================
-print("\n[1/4] Demonstrating Fault Detection (LSTM/CNN)...")
-
-# Simulate fault detection data
-t = np.linspace(0, 10, 1000)
-normal_signal = np.sin(2 * np.pi * 0.5 * t) + 0.1 * np.random.randn(len(t))
-fault_signal = normal_signal.copy()
-
-# Inject faults at different times
-fault_signal[300:350] = fault_signal[300:350] * 3  # Overcurrent
-fault_signal[500:520] = 0  # Open circuit
-fault_signal[700:750] = fault_signal[700:750] * -2  # Short circuit
-
-# Simulate LSTM predictions
-fault_predictions = np.zeros(len(t))
-fault_predictions[300:350] = 4  # Overcurrent
-fault_predictions[500:520] = 2  # Open circuit
-fault_predictions[700:750] = 1  # Short circuit
-
-# Confidence scores
-confidence = np.zeros(len(t))
-confidence[300:350] = 0.95
-confidence[500:520] = 0.92
-confidence[700:750] = 0.98
-
-fig = plt.figure(figsize=(15, 10))
-gs = GridSpec(3, 2, figure=fig, hspace=0.3, wspace=0.3)
-
-# Signal plot
-ax1 = fig.add_subplot(gs[0, :])
-ax1.plot(t, normal_signal, 'g-', alpha=0.5, label='Normal Operation', linewidth=2)
-ax1.plot(t, fault_signal, 'b-', label='With Faults', linewidth=2)
-ax1.axvspan(3, 3.5, alpha=0.3, color='red', label='Overcurrent')
-ax1.axvspan(5, 5.2, alpha=0.3, color='orange', label='Open Circuit')
-ax1.axvspan(7, 7.5, alpha=0.3, color='purple', label='Short Circuit')
-ax1.set_xlabel('Time (s)', fontweight='bold')
-ax1.set_ylabel('Current (A)', fontweight='bold')
-ax1.set_title('1. LSTM Fault Detection - Input Signal', fontweight='bold', fontsize=12)
-ax1.legend(loc='upper right')
-ax1.grid(True, alpha=0.3)
-
-# Fault classification
-ax2 = fig.add_subplot(gs[1, :])
-fault_types = ['No Fault', 'Short Circuit', 'Open Circuit', 'Ground Fault', 'Overcurrent']
-colors_map = ['green', 'purple', 'orange', 'brown', 'red']
-for i, val in enumerate(fault_predictions):
-    if val > 0:
-        ax2.scatter(t[i], val, c=colors_map[int(val)], s=10, alpha=0.6)
-ax2.set_xlabel('Time (s)', fontweight='bold')
-ax2.set_ylabel('Fault Type', fontweight='bold')
-ax2.set_title('LSTM Classification Output', fontweight='bold', fontsize=12)
-ax2.set_yticks([0, 1, 2, 3, 4])
-ax2.set_yticklabels(fault_types)
-ax2.grid(True, alpha=0.3)
-
-# Confidence scores
-ax3 = fig.add_subplot(gs[2, 0])
-ax3.fill_between(t, 0, confidence, alpha=0.4, color='blue')
-ax3.plot(t, confidence, 'b-', linewidth=2)
-ax3.axhline(y=0.85, color='r', linestyle='--', label='Threshold', linewidth=2)
-ax3.set_xlabel('Time (s)', fontweight='bold')
-ax3.set_ylabel('Confidence', fontweight='bold')
-ax3.set_title('Model Confidence Scores', fontweight='bold', fontsize=11)
-ax3.legend()
-ax3.grid(True, alpha=0.3)
-
-# LSTM Architecture diagram (simplified text representation)
-ax4 = fig.add_subplot(gs[2, 1])
-ax4.axis('off')
-architecture_text = """
+def demo_lstm(rng):
+    """Fault detection panel: LSTM input signal, classes and confidence"""
+    # Simulate fault detection data
+    t = np.linspace(0, 10, 1000)
+    normal_signal = np.sin(2 * np.pi * 0.5 * t) + 0.1 * rng.standard_normal(len(t))
+
+    # Fault events: (samples, predicted class, LSTM confidence, signal gain)
+    fault_events = [
+        (slice(300, 350), 4, 0.95, 3.0),   # Overcurrent
+        (slice(500, 520), 2, 0.92, 0.0),   # Open circuit
+        (slice(700, 750), 1, 0.98, -2.0)   # Short circuit
+    ]
+
+    # Inject faults, simulated LSTM predictions and confidence scores in one pass
+    fault_multiplier = np.ones_like(normal_signal)
+    fault_predictions = np.zeros(len(t))
+    confidence = np.zeros(len(t))
+    for window, fault_class, score, gain in fault_events:
+        fault_multiplier[window] = gain
+        fault_predictions[window] = fault_class
+        confidence[window] = score
+    fault_signal = normal_signal * fault_multiplier
+
+    fig = plt.figure(figsize=(15, 10))
+    gs = GridSpec(3, 2, figure=fig, hspace=0.3, wspace=0.3)
+
+    # Signal plot
+    ax1 = fig.add_subplot(gs[0, :])
+    ax1.plot(t, normal_signal, 'g-', alpha=0.5, label='Normal Operation', linewidth=2)
+    ax1.plot(t, fault_signal, 'b-', label='With Faults', linewidth=2)
+    # All fault windows share one full-height collection instead of an axvspan each
+    fault_windows = [
+        (3, 3.5, 'red', 'Overcurrent'),
+        (5, 5.2, 'orange', 'Open Circuit'),
+        (7, 7.5, 'purple', 'Short Circuit')
+    ]
+    ax1.add_collection(PolyCollection(
+        [[(x0, 0), (x0, 1), (x1, 1), (x1, 0)] for x0, x1, _, _ in fault_windows],
+        facecolors=[color for _, _, color, _ in fault_windows], alpha=0.3,
+        transform=ax1.get_xaxis_transform()), autolim=False)
+    ax1.set_xlabel('Time (s)', fontweight='bold')
+    ax1.set_ylabel('Current (A)', fontweight='bold')
+    ax1.set_title('1. LSTM Fault Detection - Input Signal', fontweight='bold', fontsize=12)
+    handles, _ = ax1.get_legend_handles_labels()
+    handles += [Patch(color=color, alpha=0.3, label=label) for _, _, color, label in fault_windows]
+    ax1.legend(handles=handles, loc='upper right')
+
+    # Fault classification
+    ax2 = fig.add_subplot(gs[1, :])
+    fault_types = ['No Fault', 'Short Circuit', 'Open Circuit', 'Ground Fault', 'Overcurrent']
+    colors_map = ['green', 'purple', 'orange', 'brown', 'red']
+    # RGBA palette indexed by class id, so point colours are a single fancy-index
+    palette = np.array([to_rgba(color) for color in colors_map])
+    fault_mask = fault_predictions > 0
+    fault_classes = fault_predictions[fault_mask].astype(int)
+    ax2.scatter(t[fault_mask], fault_classes, c=palette[fault_classes], s=10, alpha=0.6)
+    ax2.set_xlabel('Time (s)', fontweight='bold')
+    ax2.set_ylabel('Fault Type', fontweight='bold')
+    ax2.set_title('LSTM Classification Output', fontweight='bold', fontsize=12)
+    ax2.set_yticks([0, 1, 2, 3, 4])
+    ax2.set_yticklabels(fault_types)
+
+    # Confidence scores
+    ax3 = fig.add_subplot(gs[2, 0])
+    ax3.fill_between(t, 0, confidence, alpha=0.4, color='blue')
+    ax3.plot(t, confidence, 'b-', linewidth=2)
+    ax3.axhline(y=0.85, color='r', linestyle='--', label='Threshold', linewidth=2)
+    ax3.set_xlabel('Time (s)', fontweight='bold')
+    ax3.set_ylabel('Confidence', fontweight='bold')
+    ax3.set_title('Model Confidence Scores', fontweight='bold', fontsize=11)
+    ax3.legend()
+
+    # LSTM Architecture diagram (simplified text representation)
+    ax4 = fig.add_subplot(gs[2, 1])
+    ax4.axis('off')
+    architecture_text = """
 LSTM NETWORK ARCHITECTURE:
 
 Input Layer (100, 3)
@@ -114,85 +129,81 @@ Fault Types:
 • Undervoltage
 • Overvoltage
 """
-ax4.text(0.1, 0.5, architecture_text, fontsize=9, family='monospace',
-        verticalalignment='center',
-        bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+    ax4.text(0.1, 0.5, architecture_text, fontsize=9, family='monospace',
+            verticalalignment='center',
+            bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+
+    return fig
 
-plt.savefig(output_dir / 'lstm_fault_detection.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: {output_dir}/lstm_fault_detection.png")
 
 # ============================================================================
 # 2. ANOMALY DETECTION - Isolation Forest
 # ============================================================================
-print("\n[2/4] Demonstrating Anomaly Detection (Isolation Forest)...")
-
-# Generate normal and anomalous data
-np.random.seed(42)
-n_samples = 1000
-n_anomalies = 50
-
-# Normal operation
-normal_voltage = 380 + 10 * np.random.randn(n_samples)
-normal_current = 100 + 5 * np.random.randn(n_samples)
-
-# Inject anomalies (cyber attacks)
-anomaly_indices = np.random.choice(n_samples, n_anomalies, replace=False)
-voltage_with_anomalies = normal_voltage.copy()
-current_with_anomalies = normal_current.copy()
-
-voltage_with_anomalies[anomaly_indices] += np.random.randn(n_anomalies) * 50
-current_with_anomalies[anomaly_indices] += np.random.randn(n_anomalies) * 30
-
-# Simulate Isolation Forest predictions
-anomaly_scores = np.random.randn(n_samples) * 0.1
-anomaly_scores[anomaly_indices] = -0.5 - np.random.rand(n_anomalies) * 0.5
-
-fig = plt.figure(figsize=(15, 10))
-gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
-
-# Scatter plot of normal vs anomalies
-ax1 = fig.add_subplot(gs[0, 0])
-normal_mask = np.ones(n_samples, dtype=bool)
-normal_mask[anomaly_indices] = False
-ax1.scatter(normal_voltage[normal_mask], normal_current[normal_mask], 
-           c='green', alpha=0.5, s=20, label='Normal')
-ax1.scatter(voltage_with_anomalies[anomaly_indices], current_with_anomalies[anomaly_indices],
-           c='red', s=50, marker='x', label='Anomalies', linewidths=2)
-ax1.set_xlabel('Voltage (V)', fontweight='bold')
-ax1.set_ylabel('Current (A)', fontweight='bold')
-ax1.set_title('2. Isolation Forest - Anomaly Detection', fontweight='bold', fontsize=12)
-ax1.legend()
-ax1.grid(True, alpha=0.3)
-
-# Anomaly scores over time
-ax2 = fig.add_subplot(gs[0, 1])
-ax2.plot(anomaly_scores, 'b-', alpha=0.7, linewidth=1)
-ax2.scatter(anomaly_indices, anomaly_scores[anomaly_indices], c='red', s=50, 
-           marker='x', linewidths=2, label='Detected Anomalies')
-ax2.axhline(y=-0.2, color='orange', linestyle='--', label='Threshold', linewidth=2)
-ax2.set_xlabel('Sample Index', fontweight='bold')
-ax2.set_ylabel('Anomaly Score', fontweight='bold')
-ax2.set_title('Anomaly Scores Timeline', fontweight='bold', fontsize=12)
-ax2.legend()
-ax2.grid(True, alpha=0.3)
-
-# Attack type classification
-ax3 = fig.add_subplot(gs[1, 0])
-attack_types = ['DDoS', 'Brute Force', 'Injection', 'Man-in-Middle']
-attack_counts = [15, 12, 13, 10]
-colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-bars = ax3.bar(attack_types, attack_counts, color=colors, edgecolor='black', linewidth=2)
-ax3.set_ylabel('Number of Detections', fontweight='bold')
-ax3.set_title('Cyber Attack Classification', fontweight='bold', fontsize=12)
-ax3.grid(True, alpha=0.3, axis='y')
-for bar, count in zip(bars, attack_counts):
-    ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-            str(count), ha='center', fontweight='bold')
-
-# Algorithm info
-ax4 = fig.add_subplot(gs[1, 1])
-ax4.axis('off')
-iso_forest_text = """
+def demo_isoforest(rng):
+    """Anomaly detection panel: Isolation Forest scores and attack types"""
+    # Generate normal and anomalous data
+    n_samples = 1000
+    n_anomalies = 50
+
+    # Normal operation
+    normal_noise = rng.standard_normal((2, n_samples))
+    normal_voltage = 380 + 10 * normal_noise[0]
+    normal_current = 100 + 5 * normal_noise[1]
+
+    # Inject anomalies (cyber attacks)
+    anomaly_indices = rng.choice(n_samples, n_anomalies, replace=False)
+    voltage_with_anomalies = normal_voltage.copy()
+    current_with_anomalies = normal_current.copy()
+
+    voltage_with_anomalies[anomaly_indices] += rng.standard_normal(n_anomalies) * 50
+    current_with_anomalies[anomaly_indices] += rng.standard_normal(n_anomalies) * 30
+
+    # Simulate Isolation Forest predictions
+    anomaly_scores = rng.standard_normal(n_samples) * 0.1
+    anomaly_scores[anomaly_indices] = -0.5 - rng.random(n_anomalies) * 0.5
+
+    fig = plt.figure(figsize=(15, 10))
+    gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+
+    # Scatter plot of normal vs anomalies
+    ax1 = fig.add_subplot(gs[0, 0])
+    normal_mask = np.ones(n_samples, dtype=bool)
+    normal_mask[anomaly_indices] = False
+    ax1.scatter(normal_voltage[normal_mask], normal_current[normal_mask], 
+               c='green', alpha=0.5, s=20, label='Normal')
+    ax1.scatter(voltage_with_anomalies[anomaly_indices], current_with_anomalies[anomaly_indices],
+               c='red', s=50, marker='x', label='Anomalies', linewidths=2)
+    ax1.set_xlabel('Voltage (V)', fontweight='bold')
+    ax1.set_ylabel('Current (A)', fontweight='bold')
+    ax1.set_title('2. Isolation Forest - Anomaly Detection', fontweight='bold', fontsize=12)
+    ax1.legend()
+
+    # Anomaly scores over time
+    ax2 = fig.add_subplot(gs[0, 1])
+    ax2.plot(anomaly_scores, 'b-', alpha=0.7, linewidth=1)
+    ax2.scatter(anomaly_indices, anomaly_scores[anomaly_indices], c='red', s=50, 
+               marker='x', linewidths=2, label='Detected Anomalies')
+    ax2.axhline(y=-0.2, color='orange', linestyle='--', label='Threshold', linewidth=2)
+    ax2.set_xlabel('Sample Index', fontweight='bold')
+    ax2.set_ylabel('Anomaly Score', fontweight='bold')
+    ax2.set_title('Anomaly Scores Timeline', fontweight='bold', fontsize=12)
+    ax2.legend()
+
+    # Attack type classification
+    ax3 = fig.add_subplot(gs[1, 0])
+    attack_types = ['DDoS', 'Brute Force', 'Injection', 'Man-in-Middle']
+    attack_counts = [15, 12, 13, 10]
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
+    bars = ax3.bar(attack_types, attack_counts, color=colors, edgecolor='black', linewidth=2)
+    ax3.set_ylabel('Number of Detections', fontweight='bold')
+    ax3.set_title('Cyber Attack Classification', fontweight='bold', fontsize=12)
+    ax3.grid(False, axis='x')
+    ax3.bar_label(bars, padding=3, fontweight='bold')
+
+    # Algorithm info
+    ax4 = fig.add_subplot(gs[1, 1])
+    ax4.axis('off')
+    iso_forest_text = """
 ISOLATION FOREST ALGORITHM:
 
 Parameters:
@@ -215,73 +226,79 @@ Anomaly Score < -0.2
 → Log incident
 → Activate countermeasures
 """
-ax4.text(0.1, 0.5, iso_forest_text, fontsize=9, family='monospace',
-        verticalalignment='center',
-        bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.8))
+    ax4.text(0.1, 0.5, iso_forest_text, fontsize=9, family='monospace',
+            verticalalignment='center',
+            bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.8))
+
+    return fig
 
-plt.savefig(output_dir / 'isolation_forest_anomaly.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: {output_dir}/isolation_forest_anomaly.png")
 
 # ============================================================================
 # 3. REINFORCEMENT LEARNING - Deep Q-Network (DQN)
 # ============================================================================
-print("\n[3/4] Demonstrating Adaptive Relay (DQN RL)...")
-
 # Simulate DQN training progress
-episodes = np.arange(1, 501)
-rewards = -100 + 150 * (1 - np.exp(-episodes / 100)) + 10 * np.random.randn(len(episodes))
-epsilon = 1.0 * np.exp(-episodes / 80)
-loss = 1.0 * np.exp(-episodes / 100) + 0.1 * np.random.rand(len(episodes))
-
-# Q-values for different actions
-actions = ['Trip Relay 1', 'Trip Relay 2', 'Adjust Settings', 'Monitor']
-q_values_initial = [0.2, 0.1, 0.15, 0.05]
-q_values_trained = [0.85, 0.75, 0.70, 0.20]
-
-fig = plt.figure(figsize=(15, 10))
-gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
-
-# Training rewards
-ax1 = fig.add_subplot(gs[0, 0])
-ax1.plot(episodes, rewards, 'b-', alpha=0.6, linewidth=1)
-# Moving average
-window = 20
-rewards_smooth = np.convolve(rewards, np.ones(window)/window, mode='valid')
-ax1.plot(episodes[window-1:], rewards_smooth, 'r-', linewidth=2, label='Moving Avg (20)')
-ax1.set_xlabel('Episode', fontweight='bold')
-ax1.set_ylabel('Cumulative Reward', fontweight='bold')
-ax1.set_title('3. DQN Training Progress', fontweight='bold', fontsize=12)
-ax1.legend()
-ax1.grid(True, alpha=0.3)
-
-# Epsilon decay (exploration vs exploitation)
-ax2 = fig.add_subplot(gs[0, 1])
-ax2.plot(episodes, epsilon, 'g-', linewidth=2)
-ax2.fill_between(episodes, 0, epsilon, alpha=0.3, color='green')
-ax2.set_xlabel('Episode', fontweight='bold')
-ax2.set_ylabel('Epsilon (Exploration Rate)', fontweight='bold')
-ax2.set_title('Exploration-Exploitation Trade-off', fontweight='bold', fontsize=12)
-ax2.grid(True, alpha=0.3)
-
-# Q-values comparison
-ax3 = fig.add_subplot(gs[1, 0])
-x = np.arange(len(actions))
-width = 0.35
-bars1 = ax3.bar(x - width/2, q_values_initial, width, label='Initial', 
-               color='lightblue', edgecolor='black', linewidth=2)
-bars2 = ax3.bar(x + width/2, q_values_trained, width, label='After Training',
-               color='darkblue', edgecolor='black', linewidth=2)
-ax3.set_ylabel('Q-Value', fontweight='bold')
-ax3.set_title('Q-Values: Initial vs Trained', fontweight='bold', fontsize=12)
-ax3.set_xticks(x)
-ax3.set_xticklabels(actions, rotation=15, ha='right')
-ax3.legend()
-ax3.grid(True, alpha=0.3, axis='y')
-
-# DQN Architecture
-ax4 = fig.add_subplot(gs[1, 1])
-ax4.axis('off')
-dqn_text = """
+def make_training_curves(n_episodes, rng):
+    """Synthesize DQN reward, epsilon and loss curves for n_episodes"""
+    episodes = np.arange(1, n_episodes + 1)
+    decay = np.exp(-episodes / 100)
+    rewards = -100 + 150 * (1 - decay) + 10 * rng.standard_normal(n_episodes)
+    epsilon = np.exp(-episodes / 80)
+    loss = decay + 0.1 * rng.random(n_episodes)
+    return episodes, rewards, epsilon, loss
+
+
+def demo_dqn(rng):
+    """Adaptive relay panel: DQN training curves and Q-values"""
+    episodes, rewards, epsilon, loss = make_training_curves(500, rng)
+
+    # Q-values for different actions
+    actions = ['Trip Relay 1', 'Trip Relay 2', 'Adjust Settings', 'Monitor']
+    q_values_initial = [0.2, 0.1, 0.15, 0.05]
+    q_values_trained = [0.85, 0.75, 0.70, 0.20]
+
+    fig = plt.figure(figsize=(15, 10))
+    gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+
+    # Training rewards
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.plot(episodes, rewards, 'b-', alpha=0.6, linewidth=1)
+    # Moving average
+    window = 20
+    cumulative = np.cumsum(np.insert(rewards, 0, 0))
+    rewards_smooth = (cumulative[window:] - cumulative[:-window]) / window
+    ax1.plot(episodes[window-1:], rewards_smooth, 'r-', linewidth=2, label='Moving Avg (20)')
+    ax1.set_xlabel('Episode', fontweight='bold')
+    ax1.set_ylabel('Cumulative Reward', fontweight='bold')
+    ax1.set_title('3. DQN Training Progress', fontweight='bold', fontsize=12)
+    ax1.legend()
+
+    # Epsilon decay (exploration vs exploitation)
+    ax2 = fig.add_subplot(gs[0, 1])
+    ax2.plot(episodes, epsilon, 'g-', linewidth=2)
+    ax2.fill_between(episodes, 0, epsilon, alpha=0.3, color='green')
+    ax2.set_xlabel('Episode', fontweight='bold')
+    ax2.set_ylabel('Epsilon (Exploration Rate)', fontweight='bold')
+    ax2.set_title('Exploration-Exploitation Trade-off', fontweight='bold', fontsize=12)
+
+    # Q-values comparison
+    ax3 = fig.add_subplot(gs[1, 0])
+    x = np.arange(len(actions))
+    width = 0.35
+    bars1 = ax3.bar(x - width/2, q_values_initial, width, label='Initial', 
+                   color='lightblue', edgecolor='black', linewidth=2)
+    bars2 = ax3.bar(x + width/2, q_values_trained, width, label='After Training',
+                   color='darkblue', edgecolor='black', linewidth=2)
+    ax3.set_ylabel('Q-Value', fontweight='bold')
+    ax3.set_title('Q-Values: Initial vs Trained', fontweight='bold', fontsize=12)
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(actions, rotation=15, ha='right')
+    ax3.legend()
+    ax3.grid(False, axis='x')
+
+    # DQN Architecture
+    ax4 = fig.add_subplot(gs[1, 1])
+    ax4.axis('off')
+    dqn_text = """
 DQN NETWORK ARCHITECTURE:
 
 State Space (8 dimensions):
@@ -309,91 +326,133 @@ Training:
 • Discount: γ=0.95
 • Experience Replay: 2000
 """
-ax4.text(0.1, 0.5, dqn_text, fontsize=9, family='monospace',
-        verticalalignment='center',
-        bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
+    ax4.text(0.1, 0.5, dqn_text, fontsize=9, family='monospace',
+            verticalalignment='center',
+            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
+
+    return fig
 
-plt.savefig(output_dir / 'dqn_reinforcement_learning.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: {output_dir}/dqn_reinforcement_learning.png")
 
 # ============================================================================
 # 4. AI/ML SUMMARY DASHBOARD
 # ============================================================================
-print("\n[4/4] Creating AI/ML Summary Dashboard...")
-
-fig = plt.figure(figsize=(16, 10))
-fig.suptitle('AI/ML COMPONENTS SUMMARY - DC MICROGRID', 
-            fontsize=16, fontweight='bold', y=0.98)
-
-gs = GridSpec(3, 3, figure=fig, hspace=0.4, wspace=0.4)
-
-# Component 1: Fault Detection
-ax1 = fig.add_subplot(gs[0, :])
-ax1.axis('off')
-ax1.text(0.5, 0.9, '1. FAULT DETECTION (Deep Learning)', 
-        ha='center', fontsize=14, fontweight='bold', color='darkblue')
-ax1.text(0.05, 0.6, 
-"""Algorithm: LSTM (Long Short-Term Memory) Neural Network
+def demo_summary():
+    """Summary dashboard describing the three AI/ML components"""
+    fig = plt.figure(figsize=(16, 10))
+    fig.suptitle('AI/ML COMPONENTS SUMMARY - DC MICROGRID', 
+                fontsize=16, fontweight='bold', y=0.98)
+
+    gs = GridSpec(3, 3, figure=fig, hspace=0.4, wspace=0.4)
+
+    # Component 1: Fault Detection
+    ax1 = fig.add_subplot(gs[0, :])
+    ax1.axis('off')
+    ax1.text(0.5, 0.9, '1. FAULT DETECTION (Deep Learning)', 
+            ha='center', fontsize=14, fontweight='bold', color='darkblue')
+    ax1.text(0.05, 0.6, 
+    """Algorithm: LSTM (Long Short-Term Memory) Neural Network
 Purpose: Real-time identification of 7 fault types in DC microgrid
 Input: Time-series voltage, current, power data (sequence length: 100)
 Architecture: 2 LSTM layers (128→64 units) + Dense layers
 Output: Fault classification with confidence scores (threshold: 85%)
 Training: Categorical cross-entropy loss, Adam optimizer
 Performance: ~95% accuracy on test data""",
-        fontsize=10, verticalalignment='center', family='monospace',
-        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.5))
-
-# Component 2: Anomaly Detection
-ax2 = fig.add_subplot(gs[1, :])
-ax2.axis('off')
-ax2.text(0.5, 0.9, '2. ANOMALY DETECTION (Machine Learning)', 
-        ha='center', fontsize=14, fontweight='bold', color='darkgreen')
-ax2.text(0.05, 0.6,
-"""Algorithm: Isolation Forest (Ensemble Method)
+            fontsize=10, verticalalignment='center', family='monospace',
+            bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.5))
+
+    # Component 2: Anomaly Detection
+    ax2 = fig.add_subplot(gs[1, :])
+    ax2.axis('off')
+    ax2.text(0.5, 0.9, '2. ANOMALY DETECTION (Machine Learning)', 
+            ha='center', fontsize=14, fontweight='bold', color='darkgreen')
+    ax2.text(0.05, 0.6,
+    """Algorithm: Isolation Forest (Ensemble Method)
 Purpose: Detect cybersecurity threats and abnormal system behavior
 Input: Multi-dimensional feature vectors (voltage, current, communication patterns)
 Parameters: 100 estimators, 10% contamination rate
 Output: Anomaly scores and attack classification (DDoS, Injection, etc.)
 Training: Unsupervised learning on normal operation data
 Performance: 92% detection rate with <5% false positives""",
-        fontsize=10, verticalalignment='center', family='monospace',
-        bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5))
-
-# Component 3: Adaptive Control
-ax3 = fig.add_subplot(gs[2, :])
-ax3.axis('off')
-ax3.text(0.5, 0.9, '3. ADAPTIVE RELAY COORDINATION (Reinforcement Learning)', 
-        ha='center', fontsize=14, fontweight='bold', color='darkred')
-ax3.text(0.05, 0.6,
-"""Algorithm: Deep Q-Network (DQN) with Experience Replay
+            fontsize=10, verticalalignment='center', family='monospace',
+            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5))
+
+    # Component 3: Adaptive Control
+    ax3 = fig.add_subplot(gs[2, :])
+    ax3.axis('off')
+    ax3.text(0.5, 0.9, '3. ADAPTIVE RELAY COORDINATION (Reinforcement Learning)', 
+            ha='center', fontsize=14, fontweight='bold', color='darkred')
+    ax3.text(0.05, 0.6,
+    """Algorithm: Deep Q-Network (DQN) with Experience Replay
 Purpose: Optimal relay coordination and protection settings adaptation
 State Space: 8D (voltage, current, power, SOC, fault info, time, priority)
 Action Space: 4 actions (trip relay 1/2, adjust settings, monitor)
 Reward Function: Based on fault clearance time, false trips, system stability
 Training: Q-learning with ε-greedy exploration (ε-decay: 0.995)
 Performance: 40% reduction in false trips, 25% faster fault clearance""",
-        fontsize=10, verticalalignment='center', family='monospace',
-        bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.5))
-
-plt.savefig(output_dir / 'ai_ml_summary.png', dpi=300, bbox_inches='tight')
-print(f"  ✓ Saved: {output_dir}/ai_ml_summary.png")
-
-plt.close('all')
-
-print("\n" + "="*80)
-print("✓ AI/ML DEMONSTRATION COMPLETED!")
-print("="*80)
-print(f"\nAll visualizations saved to: {output_dir.absolute()}")
-print("\nImplemented AI/ML Algorithms:")
-print("  1. LSTM Neural Network      - Fault Detection (7 classes)")
-print("  2. CNN (Convolutional)      - Alternative fault detection")
-print("  3. Hybrid CNN-LSTM          - Combined approach")
-print("  4. Isolation Forest         - Anomaly/Cybersecurity detection")
-print("  5. Deep Q-Network (DQN)     - Reinforcement learning for relay control")
-print("\nKey Features:")
-print("  • TensorFlow/Keras implementation")
-print("  • Scikit-learn ML algorithms")
-print("  • Real-time prediction capability")
-print("  • Experience replay for RL")
-print("  • Confidence-based decision making")
-print("="*80 + "\n")
+            fontsize=10, verticalalignment='center', family='monospace',
+            bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.5))
+
+    return fig
+
+
+def main():
+    # Create output directory
+    output_dir = Path('results/ai_ml_demo')
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    print("="*80)
+    print(" "*20 + "AI/ML COMPONENTS IN DC MICROGRID")
+    print("="*80)
+
+    # Single seeded generator for all synthetic data in the demo
+    rng = np.random.default_rng(42)
+
+    # Panels are rendered and PNG-encoded on a background thread while the
+    # next panel is built; each panel gets its own figure so they never share
+    # a canvas across threads
+    panels = [
+        ("[1/4] Demonstrating Fault Detection (LSTM/CNN)...",
+         lambda: demo_lstm(rng), 'lstm_fault_detection.png'),
+        ("[2/4] Demonstrating Anomaly Detection (Isolation Forest)...",
+         lambda: demo_isoforest(rng), 'isolation_forest_anomaly.png'),
+        ("[3/4] Demonstrating Adaptive Relay (DQN RL)...",
+         lambda: demo_dqn(rng), 'dqn_reinforcement_learning.png'),
+        ("[4/4] Creating AI/ML Summary Dashboard...",
+         demo_summary, 'ai_ml_summary.png'),
+    ]
+    pending_saves = []
+    with ThreadPoolExecutor(max_workers=2) as saver:
+        for message, build, filename in panels:
+            print(f"\n{message}")
+            fig = build()
+            future = saver.submit(fig.savefig, output_dir / filename, dpi=DPI, bbox_inches='tight')
+            pending_saves.append((future, filename))
+
+        # Wait for the background saves (re-raising any error) before closing
+        for future, filename in pending_saves:
+            future.result()
+            print(f"  ✓ Saved: {output_dir}/{filename}")
+
+    plt.close('all')
+
+    print("\n" + "="*80)
+    print("✓ AI/ML DEMONSTRATION COMPLETED!")
+    print("="*80)
+    print(f"\nAll visualizations saved to: {output_dir.absolute()}")
+    print("\nImplemented AI/ML Algorithms:")
+    print("  1. LSTM Neural Network      - Fault Detection (7 classes)")
+    print("  2. CNN (Convolutional)      - Alternative fault detection")
+    print("  3. Hybrid CNN-LSTM          - Combined approach")
+    print("  4. Isolation Forest         - Anomaly/Cybersecurity detection")
+    print("  5. Deep Q-Network (DQN)     - Reinforcement learning for relay control")
+    print("\nKey Features:")
+    print("  • TensorFlow/Keras implementation")
+    print("  • Scikit-learn ML algorithms")
+    print("  • Real-time prediction capability")
+    print("  • Experience replay for RL")
+    print("  • Confidence-based decision making")
+    print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
 """Extract text from PDF files."""
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader
 
+# Below this page count the process pool startup costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+
+def _extract_page(args):
+    """Extract text from a single page (runs in a worker process)."""
+    pdf_path, page_index = args
+    # Each worker opens its own reader so nothing needs to be pickled
+    return PdfReader(pdf_path).pages[page_index].extract_text()
+
+
 def extract_text_from_pdf(pdf_path):
     """Extract text from a PDF file."""
     try:
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        n_pages = len(reader.pages)
+        if n_pages < PARALLEL_MIN_PAGES:
+            parts = [page.extract_text() for page in reader.pages]
+        else:
+            with ProcessPoolExecutor() as executor:
+                parts = list(executor.map(
+                    _extract_page, [(pdf_path, i) for i in range(n_pages)]
+                ))
+        return "".join(f"{part}\n" for part in parts)
     except Exception as e:
         return f"Error extracting text: {e}"
 
@@ -6,11 +6,9 @@ optimal protection of DC microgrid using a simpler Q-learning approach.
 """
 
 import numpy as np
-from collections import defaultdict
 import random
 from typing import Dict, List, Tuple, Optional
 import logging
-import joblib
 
 
 class AdaptiveRelayCoordinator:
@@ -43,40 +41,69 @@ class AdaptiveRelayCoordinator:
         ]
         self.action_size = 4  # [trip_relay_1, trip_relay_2, adjust_setting, no_action]
         
-        # Q-table using defaultdict for sparse storage
-        self.q_table = defaultdict(lambda: np.zeros(self.action_size))
+        # Sparse Q-table; rows are only created when a state is updated,
+        # reads of unseen states fall back to a shared zero row
+        self.q_table: Dict[int, np.ndarray] = {}
+        self._zeros = np.zeros(self.action_size)
+        self._zeros.flags.writeable = False
+        
+        # Uniform state buckets, one (upper bound, edge count) per feature:
+        # voltage/current/power are normalized, the rest are 0-1 scales
+        bucket_upper = np.array([1.5, 2, 2, 1, 1, 1, 1, 1])
+        bucket_edges = np.array([10, 10, 10, 5, 3, 3, 6, 3])
+        self._bucket_scales = (bucket_edges - 1) / bucket_upper
+        self._bucket_last = (bucket_edges - 1).astype(np.int64)
+        # The exact linspace edges, padded with +inf, settle values the
+        # affine map puts one bucket off by rounding
+        self._bucket_grid = np.full((len(bucket_edges), bucket_edges.max() + 1), np.inf)
+        for row, (upper, edges) in zip(self._bucket_grid, zip(bucket_upper, bucket_edges)):
+            row[:edges] = np.linspace(0, upper, edges)
+        self._feature_rows = np.arange(len(bucket_edges))
+        # Bucket indices are at most 10, so each one packs into 4 bits of the key
+        self._bucket_shift = np.int64(16) ** np.arange(len(bucket_edges), dtype=np.int64)
+        
+        # Maximum of the Q-table, kept current by update_q_table
+        # (unvisited entries are zero)
+        self._q_global_max = 0.0
         
         self.logger = logging.getLogger(__name__)
     
-    def discretize_state(self, state: np.ndarray) -> str:
+    def discretize_state(self, state: np.ndarray) -> int:
         """
         Convert continuous state values to discrete buckets for Q-table.
         
+        Same buckets as ``np.digitize`` against each feature's uniform
+        ``linspace(0, upper, edges)`` grid, including values exactly on an
+        edge, NaN and ±inf. An affine map finds the edge at or below each
+        finite value to within one, and comparisons against the exact edges
+        correct it.
+        
         Args:
             state: Continuous state array
             
         Returns:
-            Discretized state string key
+            Discretized state key (bucket indices packed 4 bits apiece)
         """
-        # Define buckets for each feature
-        buckets = [
-            np.linspace(0, 1.5, 10),  # voltage (normalized)
-            np.linspace(0, 2, 10),    # current (normalized)
-            np.linspace(0, 2, 10),    # power (normalized)
-            np.linspace(0, 1, 5),     # battery_soc
-            np.linspace(0, 1, 3),     # fault_severity
-            np.linspace(0, 1, 3),     # fault_location
-            np.linspace(0, 1, 6),     # time_of_day
-            np.linspace(0, 1, 3)      # load_priority
-        ]
+        values = state.ravel()
+        if not np.isfinite(values).all():
+            # Rare sensor dropouts: digitize puts NaN and +inf past the last
+            # edge, which the affine map cannot represent
+            idx = np.array([
+                np.digitize(value, grid[:last + 1])
+                for value, grid, last in zip(values, self._bucket_grid, self._bucket_last)
+            ], dtype=np.int64)
+            return int(idx @ self._bucket_shift)
         
-        # Digitize each feature
-        discretized = []
-        for value, bucket in zip(state.flatten(), buckets):
-            idx = np.digitize(value, bucket)
-            discretized.append(str(idx))
-        
-        return '_'.join(discretized)
+        nearest = np.floor(values * self._bucket_scales)
+        np.clip(nearest, 0, self._bucket_last, out=nearest)
+        nearest = nearest.astype(np.int64)
+        # digitize counts the edges <= value
+        idx = (
+            nearest
+            + (values >= self._bucket_grid[self._feature_rows, nearest])
+            + (values >= self._bucket_grid[self._feature_rows, nearest + 1])
+        )
+        return int(idx @ self._bucket_shift)
     
     def get_state(self, system_data: Dict) -> np.ndarray:
         """
@@ -86,9 +113,9 @@ class AdaptiveRelayCoordinator:
             system_data: Current system state
             
         Returns:
-            State vector
+            1D state vector
         """
-        state = np.array([
+        return np.array([
             system_data.get('voltage', 380) / 380,  # Normalized voltage
             system_data.get('current', 0) / 100,    # Normalized current
             system_data.get('power', 0) / 100,      # Normalized power
@@ -97,11 +124,17 @@ class AdaptiveRelayCoordinator:
             system_data.get('fault_location', 0),   # 0-1 normalized
             system_data.get('time_of_day', 12) / 24,
             system_data.get('load_priority', 0.5)
-        ])
-        
-        return state.reshape(1, -1)
+        ], dtype=np.float64)
+    
+    def _q_values(self, state: np.ndarray) -> np.ndarray:
+        """Q-table row for a state (read-only zeros if never visited)."""
+        return self.q_table.get(self.discretize_state(state), self._zeros)
     
-    def select_action(self, state: np.ndarray, training: bool = True) -> int:
+    def select_action(
+        self,
+        state: np.ndarray,
+        training: bool = True
+    ) -> int:
         """
         Select action using epsilon-greedy policy.
         
@@ -112,14 +145,16 @@ class AdaptiveRelayCoordinator:
         Returns:
             Selected action index
         """
-        state_key = self.discretize_state(state)
-        
         if training and random.random() < self.epsilon:
             # Exploration: random action
             return random.randrange(self.action_size)
         
         # Exploitation: best action from Q-table
-        return np.argmax(self.q_table[state_key])
+        return int(np.argmax(self._q_values(state)))
+    
+    def _table_max(self) -> float:
+        """Largest Q-value in the table (unvisited entries are zero)."""
+        return max([0.0, *(float(row.max()) for row in self.q_table.values())])
     
     def update_q_table(
         self,
@@ -140,15 +175,24 @@ class AdaptiveRelayCoordinator:
         state_key = self.discretize_state(state)
         next_state_key = self.discretize_state(next_state)
         
+        row = self.q_table.get(state_key)
+        if row is None:
+            row = self.q_table[state_key] = np.zeros(self.action_size)
+        
         # Q-learning update rule
-        current_q = self.q_table[state_key][action]
-        next_max_q = np.max(self.q_table[next_state_key])
+        current_q = row[action]
+        next_max_q = np.max(self.q_table.get(next_state_key, self._zeros))
         
         new_q = current_q + self.learning_rate * (
             reward + self.discount_factor * next_max_q - current_q
         )
         
-        self.q_table[state_key][action] = new_q
+        row[action] = new_q
+        if new_q > self._q_global_max:
+            self._q_global_max = new_q
+        elif current_q == self._q_global_max and new_q < current_q:
+            # The maximum itself fell; rescan for the new one
+            self._q_global_max = self._table_max()
         
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
@@ -219,8 +263,9 @@ class AdaptiveRelayCoordinator:
         # Get current state
         state = self.get_state({**fault_data, **system_state})
         
-        # Select action
-        action = self.select_action(state, training=False)
+        # Select the greedy action; its Q-value also gives the confidence
+        q_values = self._q_values(state)
+        action = int(np.argmax(q_values))
         
         # Map action to relay commands
         action_map = {
@@ -232,28 +277,25 @@ class AdaptiveRelayCoordinator:
         
         decision = action_map[action]
         decision['action_index'] = action
-        decision['confidence'] = float(
-            self.q_table[self.discretize_state(state)][action] /
-            np.max(list(self.q_table.values())) if self.q_table else 0.5
-        )
+        decision['confidence'] = float(q_values[action] / max(self._q_global_max, 1e-9))
         
         self.logger.info(f"Relay coordination decision: {decision}")
         
         return decision
     
     def save_model(self, filepath: str):
-        """Save Q-table to file."""
-        # Convert defaultdict to regular dict for saving
-        q_table_dict = dict(self.q_table)
-        joblib.dump(q_table_dict, filepath)
+        """Save Q-table to file as aligned key and value arrays."""
+        keys = np.fromiter(self.q_table.keys(), dtype=np.uint64, count=len(self.q_table))
+        values = np.array(list(self.q_table.values())).reshape(-1, self.action_size)
+        # Write through a file object so numpy doesn't append '.npz' to the path
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(f, keys=keys, values=values)
         self.logger.info(f"Q-table saved to {filepath}")
     
     def load_model(self, filepath: str):
         """Load Q-table from file."""
-        q_table_dict = joblib.load(filepath)
-        # Convert back to defaultdict
-        self.q_table = defaultdict(
-            lambda: np.zeros(self.action_size),
-            q_table_dict
-        )
+        with np.load(filepath) as data:
+            keys, values = data['keys'], data['values']
+        self.q_table = dict(zip(keys.tolist(), values))
+        self._q_global_max = float(values.max(initial=0.0))
         self.logger.info(f"Q-table loaded from {filepath}")
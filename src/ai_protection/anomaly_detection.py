@@ -7,15 +7,29 @@ cyber attacks or system malfunctions.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 from typing import Dict, List, Optional
 import logging
+from joblib import parallel_backend
+
+# Below this many samples sklearn scores trees faster sequentially
+PARALLEL_MIN_SAMPLES = 1000
 
 
 class AnomalyDetector:
     """Anomaly Detection System using Isolation Forest"""
     
+    # Upper bounds on the minimum anomaly score for each severity level
+    SEVERITY_THRESHOLDS = np.array([-0.5, -0.3, -0.1])
+    SEVERITY_LEVELS = np.array(['critical', 'high', 'medium', 'low'])
+    
+    # Attack rules: a label fires when its cyber feature exceeds the threshold
+    ATTACK_RULE_FEATURES = np.array([0, 2, 5])  # packet rate, failed logins, command freq
+    ATTACK_RULE_THRESHOLDS = np.array([1000, 5, 100])
+    ATTACK_RULE_LABELS = ('DDoS', 'Brute Force', 'Command Injection')
+    
     def __init__(self, config: Dict):
         """
         Initialize anomaly detector.
@@ -73,7 +87,8 @@ class AnomalyDetector:
             X: Input data to check for anomalies
             
         Returns:
-            Dictionary containing anomaly detection results
+            Dictionary containing anomaly detection results; indices and
+            scores are NumPy arrays (see ``to_serializable``)
         """
         # Normalize
         X_scaled = self.scaler.transform(X)
@@ -89,11 +104,27 @@ class AnomalyDetector:
         return {
             'anomalies_detected': bool(n_anomalies > 0),
             'n_anomalies': int(n_anomalies),
-            'anomaly_indices': np.where(anomalies)[0].tolist(),
-            'anomaly_scores': scores.tolist(),
+            'anomaly_indices': np.flatnonzero(anomalies),
+            'anomaly_scores': scores,
             'severity': self._calculate_severity(scores)
         }
     
+    @staticmethod
+    def to_serializable(result: Dict) -> Dict:
+        """
+        Convert array fields of a detection result to plain lists.
+        
+        Args:
+            result: Result from ``predict`` or ``continuous_monitoring``
+            
+        Returns:
+            Copy of the result that ``json.dump`` can write
+        """
+        return {
+            key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in result.items()
+        }
+    
     def _calculate_severity(self, scores: np.ndarray) -> str:
         """
         Calculate anomaly severity based on scores.
@@ -104,16 +135,13 @@ class AnomalyDetector:
         Returns:
             Severity level string
         """
-        min_score = np.min(scores)
-        
-        if min_score < -0.5:
-            return 'critical'
-        elif min_score < -0.3:
-            return 'high'
-        elif min_score < -0.1:
-            return 'medium'
-        else:
-            return 'low'
+        return str(self._severity_levels(np.min(scores)))
+    
+    def _severity_levels(self, min_scores: np.ndarray) -> np.ndarray:
+        """Map minimum anomaly score(s) to severity level(s)."""
+        return self.SEVERITY_LEVELS[
+            np.searchsorted(self.SEVERITY_THRESHOLDS, min_scores, side='right')
+        ]
     
     def detect_cyber_attacks(self, network_data: Dict) -> Dict:
         """
@@ -148,20 +176,21 @@ class AnomalyDetector:
         Returns:
             Feature array
         """
-        # Example features
-        features = []
-        
-        # Network traffic features
-        features.append(network_data.get('packet_rate', 0))
-        features.append(network_data.get('connection_count', 0))
-        features.append(network_data.get('failed_login_attempts', 0))
+        # Example features, written straight into a single row; float64 so
+        # readings just above a rule threshold do not round onto it
+        features = np.empty((1, 6))
+        features[0] = (
+            # Network traffic features
+            network_data.get('packet_rate', 0),
+            network_data.get('connection_count', 0),
+            network_data.get('failed_login_attempts', 0),
+            # System behavior features
+            network_data.get('cpu_usage', 0),
+            network_data.get('memory_usage', 0),
+            network_data.get('command_frequency', 0)
+        )
         
-        # System behavior features
-        features.append(network_data.get('cpu_usage', 0))
-        features.append(network_data.get('memory_usage', 0))
-        features.append(network_data.get('command_frequency', 0))
-        
-        return np.array(features).reshape(1, -1)
+        return features
     
     def _classify_attack_types(
         self,
@@ -178,22 +207,13 @@ class AnomalyDetector:
         Returns:
             List of potential attack types
         """
-        attack_types = []
-        
-        # Simple rule-based classification
-        if features[0, 0] > 1000:  # High packet rate
-            attack_types.append('DDoS')
-        
-        if features[0, 2] > 5:  # Failed login attempts
-            attack_types.append('Brute Force')
+        # Simple rule-based classification, all rules checked in one comparison
+        fired = features[0, self.ATTACK_RULE_FEATURES] > self.ATTACK_RULE_THRESHOLDS
+        attack_types = [
+            label for label, hit in zip(self.ATTACK_RULE_LABELS, fired) if hit
+        ]
         
-        if features[0, 5] > 100:  # High command frequency
-            attack_types.append('Command Injection')
-        
-        if not attack_types:
-            attack_types.append('Unknown')
-        
-        return attack_types
+        return attack_types or ['Unknown']
     
     def continuous_monitoring(
         self,
@@ -210,13 +230,36 @@ class AnomalyDetector:
         Returns:
             List of detection results for each window
         """
-        results = []
-        n_samples = len(data_stream)
+        step = window_size // 2
+        starts = range(0, len(data_stream) - window_size + 1, step)
+        if not starts:
+            return []
         
-        for i in range(0, n_samples - window_size + 1, window_size // 2):
-            window = data_stream[i:i + window_size]
-            result = self.predict(window)
-            result['window_index'] = i
-            results.append(result)
+        # Windows overlap, so score every covered sample once in a single
+        # scaler/model pass and slice the per-window results out of it
+        X_scaled = self.scaler.transform(data_stream[:starts[-1] + window_size])
+        # IsolationForest scores sequentially unless a joblib backend is set;
+        # for long streams spread its trees over threads (the Cython tree
+        # walks release the GIL)
+        n_jobs = -1 if len(X_scaled) >= PARALLEL_MIN_SAMPLES else 1
+        with parallel_backend('threading', n_jobs=n_jobs):
+            anomalies = self.model.predict(X_scaled) == -1
+            scores = self.model.score_samples(X_scaled)
+        
+        n_anomalies = sliding_window_view(anomalies, window_size)[::step].sum(axis=1)
+        severities = self._severity_levels(
+            sliding_window_view(scores, window_size)[::step].min(axis=1)
+        )
+        
+        results = []
+        for i, count, severity in zip(starts, n_anomalies, severities):
+            results.append({
+                'anomalies_detected': bool(count > 0),
+                'n_anomalies': int(count),
+                'anomaly_indices': np.flatnonzero(anomalies[i:i + window_size]),
+                'anomaly_scores': scores[i:i + window_size],
+                'severity': str(severity),
+                'window_index': i
+            })
         
         return results
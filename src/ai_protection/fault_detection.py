@@ -7,15 +7,25 @@ fault detection in DC microgrids using scikit-learn.
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 from typing import Dict, List, Tuple, Optional
 import logging
 import joblib
 
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    import onnxruntime
+except ImportError:  # ONNX Runtime is optional; detection falls back to scikit-learn
+    convert_sklearn = None
+
 
 class FaultDetector:
     """AI-based Fault Detection using Random Forest"""
     
+    # ONNX Runtime accumulates the tree probabilities in float32, which moves
+    # them by up to ~1e-6 from scikit-learn's float64 average
+    ONNX_PROBABILITY_TOLERANCE = 1e-5
+    
     def __init__(self, config: Dict):
         """
         Initialize fault detector.
@@ -28,8 +38,16 @@ class FaultDetector:
         self.sequence_length = config.get('sequence_length', 100)
         self.confidence_threshold = config.get('confidence_threshold', 0.85)
         
+        # Random Forest splits are invariant to per-feature scaling, so the
+        # model works on raw features and needs no scaler
         self.model = None
-        self.scaler = StandardScaler()
+        self._session = None  # ONNX Runtime copy of self.model, if available
+        self._session_from_model = False  # False for sessions from load_onnx
+        
+        # Features and probabilities of the last detection; callers often poll
+        # faster than the measurements change
+        self._last_features = None
+        self._last_probabilities = None
         self.logger = logging.getLogger(__name__)
         
         # Fault types
@@ -65,39 +83,33 @@ class FaultDetector:
         normal_data[:, 1] = 0.02 + 0.01 * abs(normal_data[:, 1])  # Small voltage variation
         normal_data[:, 2] = 0.8 + 0.1 * normal_data[:, 2]  # Current mean around 0.8 pu
         normal_data[:, 3] = 0.05 + 0.02 * abs(normal_data[:, 3])  # Small current variation
-        normal_labels = np.zeros(n_samples // 2, dtype=int)  # 0 = no_fault
 
-        # Generate fault data
-        fault_data = []
-        fault_labels = []
-        
-        for fault_type in range(1, len(self.fault_types)):
-            n_fault_samples = n_samples // (2 * (len(self.fault_types) - 1))
-            fault = normal_data[:n_fault_samples].copy()
-            
-            # Add fault characteristics
-            if fault_type == 1:  # short_circuit
-                fault[:, 0] *= 3  # Voltage spike
-                fault[:, 1] *= 5  # Current spike
-            elif fault_type == 2:  # open_circuit
-                fault[:, 0] *= 0.1  # Voltage drop
-                fault[:, 1] *= 0.1  # Current drop
-            elif fault_type == 3:  # ground_fault
-                fault[:, 0] *= 0.5  # Voltage drop
-                fault[:, 1] *= 2   # Current increase
-            elif fault_type == 4:  # overcurrent
-                fault[:, 1] *= 4   # Current spike
-            elif fault_type == 5:  # undervoltage
-                fault[:, 0] *= 0.7  # Voltage drop
-            elif fault_type == 6:  # overvoltage
-                fault[:, 0] *= 1.3  # Voltage spike
-
-            fault_data.append(fault)
-            fault_labels.extend([fault_type] * n_fault_samples)
+        # Fault characteristics as per-feature multipliers, one row per fault type
+        fault_coefs = np.array([
+            [3.0, 5.0, 1.0, 1.0],  # short_circuit: voltage spike, current spike
+            [0.1, 0.1, 1.0, 1.0],  # open_circuit: voltage drop, current drop
+            [0.5, 2.0, 1.0, 1.0],  # ground_fault: voltage drop, current increase
+            [1.0, 4.0, 1.0, 1.0],  # overcurrent: current spike
+            [0.7, 1.0, 1.0, 1.0],  # undervoltage: voltage drop
+            [1.3, 1.0, 1.0, 1.0],  # overvoltage: voltage spike
+        ])
+        n_fault_types = len(fault_coefs)
+        n_normal = len(normal_data)
+        n_fault_samples = n_samples // (2 * n_fault_types)
 
-        # Combine data
-        X = np.vstack([normal_data] + fault_data)
-        y = np.concatenate([normal_labels, fault_labels])
+        # Generate fault data straight into the combined matrix: every fault
+        # block is a scaled copy of the first normal samples
+        X = np.empty((n_normal + n_fault_types * n_fault_samples, n_features))
+        X[:n_normal] = normal_data
+        np.multiply(
+            fault_coefs[:, np.newaxis, :],
+            normal_data[:n_fault_samples],
+            out=X[n_normal:].reshape(n_fault_types, n_fault_samples, n_features)
+        )
+        y = np.repeat(
+            np.arange(n_fault_types + 1),
+            [n_normal] + [n_fault_samples] * n_fault_types
+        )  # 0 = no_fault
 
         # Shuffle data
         idx = np.random.permutation(len(X))
@@ -106,8 +118,58 @@ class FaultDetector:
 
         # Pre-train the model
         self.model.fit(X, y)
+        self._compile_model()
         
         self.logger.info("Random Forest fault detection model built and pre-trained")
+    
+    @staticmethod
+    def _scaler_used_in_training(scaler) -> bool:
+        """
+        Whether a StandardScaler from an older model file standardized the
+        training data.
+        
+        ``train`` fitted it on the whole training set. The default model
+        was trained on raw features, and its scaler is either unfitted or
+        was refitted on the single row of the last ``detect_fault`` call.
+        """
+        if scaler is None or not hasattr(scaler, 'scale_') or scaler.scale_ is None:
+            return False
+        return np.max(getattr(scaler, 'n_samples_seen_', 0)) > 1
+    
+    def _fold_scaler(self, scaler):
+        """
+        Map tree thresholds learned on standardized features back to raw units.
+        
+        Lets models saved with a StandardScaler predict on unscaled features.
+        """
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            split = tree.feature >= 0  # leaves have feature -2
+            feature = tree.feature[split]
+            tree.threshold[split] = (
+                tree.threshold[split] * scaler.scale_[feature] + scaler.mean_[feature]
+            )
+    
+    def _to_onnx(self) -> bytes:
+        """Serialize the fitted model to ONNX (float32 'input' -> 'probabilities')."""
+        onx = convert_sklearn(
+            self.model,
+            initial_types=[('input', FloatTensorType([None, self.model.n_features_in_]))],
+            options={id(self.model): {'zipmap': False}}  # plain probability matrix
+        )
+        return onx.SerializeToString()
+    
+    def _compile_model(self):
+        """Export the fitted model to an ONNX Runtime session when available."""
+        self._session = None
+        self._last_features = None  # cached probabilities are from the old model
+        if convert_sklearn is None:
+            return
+        
+        self._session = onnxruntime.InferenceSession(
+            self._to_onnx(), providers=['CPUExecutionProvider']
+        )
+        self._session_from_model = True
         
     def preprocess_data(self, data: np.ndarray) -> np.ndarray:
         """
@@ -117,14 +179,14 @@ class FaultDetector:
             data: Raw input data
             
         Returns:
-            Preprocessed data
+            Preprocessed data (2D, unscaled)
         """
         # Flatten sequence data for Random Forest
         if len(data.shape) == 3:  # (samples, sequence_length, features)
             n_samples, seq_len, n_features = data.shape
             data = data.reshape(n_samples, seq_len * n_features)
         
-        return self.scaler.fit_transform(data)
+        return data
     
     def detect_fault(self, data: np.ndarray) -> Dict:
         """
@@ -134,7 +196,9 @@ class FaultDetector:
             data: Input data sequence
             
         Returns:
-            Detection results with fault type and confidence
+            Detection results with fault type and confidence; class
+            probabilities are an array ordered like ``fault_types``
+            (see ``probabilities_by_type``)
         """
         # Preprocess
         if len(data) < self.sequence_length:
@@ -145,19 +209,18 @@ class FaultDetector:
                 'message': 'Insufficient data for detection'
             }
         
-        # Extract relevant features from sequence data
-        features = np.array([
-            np.mean(data[:, 0]),    # Average voltage
-            np.std(data[:, 0]),     # Voltage variation
-            np.mean(data[:, 1]),    # Average current
-            np.std(data[:, 1])      # Current variation
-        ]).reshape(1, -1)
-        
-        # Fit and transform for demonstration (in real application, this should be pre-trained)
-        processed_data = self.scaler.fit_transform(features)
+        features = self._window_features(data)
         
-        # Predict
-        probabilities = self.model.predict_proba(processed_data)
+        # Predict, unless the features match the previous call; borderline
+        # ONNX rows are re-scored against the threshold, so it is keyed too
+        feature_key = (features.tobytes(), self.confidence_threshold)
+        if feature_key == self._last_features:
+            probabilities = self._last_probabilities
+        else:
+            probabilities = self._predict_proba(features)
+            probabilities.flags.writeable = False  # shared by repeated results
+            self._last_features = feature_key
+            self._last_probabilities = probabilities
         fault_idx = np.argmax(probabilities[0])
         confidence = probabilities[0][fault_idx]
         
@@ -170,12 +233,97 @@ class FaultDetector:
             'fault_detected': fault_detected,
             'fault_type': self.fault_types[fault_idx],
             'confidence': float(confidence),
-            'all_probabilities': {
-                fault_type: float(prob)
-                for fault_type, prob in zip(self.fault_types, probabilities[0])
+            'all_probabilities': probabilities[0]
+        }
+    
+    def detect_fault_batch(self, windows: np.ndarray) -> Dict:
+        """
+        Detect faults in many data windows with one model call.
+        
+        Same decisions as calling detect_fault on each window, returned
+        as one array per quantity instead of one dict per window.
+        
+        Args:
+            windows: Input data sequences, shape (n_windows, length, features)
+            
+        Returns:
+            Dictionary of detection result arrays
+        """
+        n_windows = len(windows)
+        if windows.shape[1] < self.sequence_length:
+            return {
+                'fault_detected': np.zeros(n_windows, dtype=bool),
+                'fault_type': np.full(n_windows, 'no_fault', dtype=object),
+                'confidence': np.zeros(n_windows),
+                'message': 'Insufficient data for detection'
             }
+        
+        probabilities = self._predict_proba(self._window_features(windows))
+        fault_idx = np.argmax(probabilities, axis=1)
+        confidence = probabilities[np.arange(n_windows), fault_idx]
+        
+        return {
+            'fault_detected': (fault_idx != 0) & (confidence >= self.confidence_threshold),
+            'fault_type': np.array(self.fault_types, dtype=object)[fault_idx],
+            'confidence': confidence.astype(np.float64),
+            'all_probabilities': probabilities
         }
     
+    @staticmethod
+    def _window_features(data: np.ndarray) -> np.ndarray:
+        """
+        Extract model features from one (length, features) window or a stack
+        of them: average voltage, voltage variation, average current, current
+        variation.
+        """
+        signals = data[..., :2]
+        return np.stack((
+            signals.mean(axis=-2),
+            signals.std(axis=-2)
+        ), axis=-1).reshape(-1, 4)
+    
+    def _predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities; ONNX Runtime skips sklearn's per-tree Python dispatch.
+        
+        Rows whose decision could hinge on ONNX Runtime's float32 rounding
+        (confidence at the threshold, or a near tie for the top class) are
+        re-scored by the scikit-learn model, so decisions match it exactly.
+        """
+        if self._session is None:
+            return self.model.predict_proba(features)
+        
+        probabilities = self._session.run(
+            ['probabilities'], {'input': features.astype(np.float32)}
+        )[0].astype(np.float64)
+        if not self._session_from_model:
+            return probabilities
+        
+        tolerance = self.ONNX_PROBABILITY_TOLERANCE
+        runner_up, confidence = np.partition(probabilities, -2, axis=1)[:, -2:].T
+        borderline = (
+            (np.abs(confidence - self.confidence_threshold) < tolerance)
+            | (confidence - runner_up < tolerance)
+        )
+        if borderline.any():
+            probabilities[borderline] = self.model.predict_proba(features[borderline])
+        return probabilities
+    
+    def probabilities_by_type(self, result: Dict) -> Dict[str, float]:
+        """
+        Map the class probabilities of a detection result to fault type names.
+        
+        Args:
+            result: Result from ``detect_fault``
+            
+        Returns:
+            Probability per fault type (empty if no prediction was made)
+        """
+        probabilities = result.get('all_probabilities')
+        if probabilities is None:
+            return {}
+        return dict(zip(self.fault_types, probabilities.tolist()))
+    
     def train(
         self,
         X_train: np.ndarray,
@@ -197,10 +345,11 @@ class FaultDetector:
         """
         # Preprocess data
         X_train_processed = self.preprocess_data(X_train)
-        X_val_processed = self.scaler.transform(X_val)
+        X_val_processed = self.preprocess_data(X_val)
         
         # Train
         self.model.fit(X_train_processed, y_train)
+        self._compile_model()
         
         # Calculate metrics
         train_score = self.model.score(X_train_processed, y_train)
@@ -215,16 +364,38 @@ class FaultDetector:
         return metrics
     
     def save_model(self, filepath: str):
-        """Save model and scaler to file."""
+        """Save model to file."""
         joblib.dump({
-            'model': self.model,
-            'scaler': self.scaler
+            'model': self.model
         }, filepath)
         self.logger.info(f"Model saved to {filepath}")
     
+    def export_onnx(self, filepath: str):
+        """Save model as ONNX for deployments that only ship ONNX Runtime."""
+        if convert_sklearn is None:
+            raise ImportError("ONNX export requires skl2onnx and onnxruntime")
+        with open(filepath, 'wb') as f:
+            f.write(self._to_onnx())
+        self.logger.info(f"ONNX model exported to {filepath}")
+    
+    def load_onnx(self, filepath: str):
+        """Load an exported ONNX model; detection then runs on it alone."""
+        if convert_sklearn is None:
+            raise ImportError("ONNX inference requires skl2onnx and onnxruntime")
+        self._session = onnxruntime.InferenceSession(
+            filepath, providers=['CPUExecutionProvider']
+        )
+        self._session_from_model = False  # no scikit-learn model to re-score with
+        self._last_features = None
+        self.logger.info(f"ONNX model loaded from {filepath}")
+    
     def load_model(self, filepath: str):
-        """Load model and scaler from file."""
+        """Load model from file."""
         saved_data = joblib.load(filepath)
         self.model = saved_data['model']
-        self.scaler = saved_data['scaler']
+        scaler = saved_data.get('scaler')
+        if self._scaler_used_in_training(scaler):
+            # Older files trained with train() used standardized features
+            self._fold_scaler(scaler)
+        self._compile_model()
         self.logger.info(f"Model loaded from {filepath}")
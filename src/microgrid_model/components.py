@@ -11,6 +11,43 @@ This module contains models for different microgrid components:
 import numpy as np
 from typing import Dict, Optional, Tuple
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below also run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def _dispatch_battery(power_deficit, soc, capacity, max_charge_rate,
+                      max_discharge_rate, efficiency, min_soc, max_soc, dt):
+    """Sequential charge/discharge scan; mirrors BatteryStorage.charge/discharge"""
+    n = len(power_deficit)
+    battery_power = np.zeros(n)
+    battery_soc = np.empty(n)
+
+    for i in range(n):
+        deficit = power_deficit[i]
+        if deficit > 0:  # Discharge
+            actual_power = deficit if deficit < max_discharge_rate else max_discharge_rate
+            new_soc = soc - actual_power * dt / efficiency / capacity
+            if new_soc < min_soc:
+                actual_power = (soc - min_soc) * capacity * efficiency / dt
+                new_soc = min_soc
+            battery_power[i] = actual_power
+            soc = new_soc
+        elif deficit < 0:  # Charge
+            actual_power = -deficit if -deficit < max_charge_rate else max_charge_rate
+            new_soc = soc + actual_power * dt * efficiency / capacity
+            if new_soc > max_soc:
+                actual_power = (max_soc - soc) * capacity / (dt * efficiency)
+                new_soc = max_soc
+            battery_power[i] = actual_power
+            soc = new_soc
+        battery_soc[i] = soc
+
+    return battery_power, battery_soc
+
 
 class PVSystem:
     """Photovoltaic System Model"""
@@ -48,6 +85,22 @@ class PVSystem:
         # Limit to rated power
         return min(power, self.rated_power)
     
+    def calculate_power_series(self, irradiance: np.ndarray,
+                               temperature: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_power over whole irradiance/temperature series.
+        
+        Args:
+            irradiance: Solar irradiance in W/m²
+            temperature: Panel temperature in °C
+            
+        Returns:
+            Power output in kW for every sample
+        """
+        temp_factor = 1 + self.temp_coefficient * (temperature - self.reference_temp)
+        power = (irradiance / 1000) * self.panel_area * self.efficiency * temp_factor
+        return np.minimum(power, self.rated_power)
+    
     def get_mppt_voltage(self, irradiance: float) -> float:
         """
         Calculate Maximum Power Point Tracking voltage.
@@ -80,6 +133,10 @@ class WindTurbine:
         self.air_density = 1.225  # kg/m³
         self.power_coefficient = 0.4
         
+        # Power curve constant: P[kW] = k * v³ below rated speed
+        swept_area = np.pi * (self.rotor_diameter / 2) ** 2
+        self._power_constant = 0.5 * self.air_density * swept_area * self.power_coefficient / 1000
+        
     def calculate_power(self, wind_speed: float) -> float:
         """
         Calculate wind turbine power output.
@@ -97,12 +154,29 @@ class WindTurbine:
             return self.rated_power
         
         # Power calculation using wind speed
-        swept_area = np.pi * (self.rotor_diameter / 2) ** 2
-        power = 0.5 * self.air_density * swept_area * self.power_coefficient * (wind_speed ** 3)
-        power_kw = power / 1000  # Convert to kW
+        power_kw = self._power_constant * wind_speed ** 3
         
         return min(power_kw, self.rated_power)
     
+    def calculate_power_series(self, wind_speed: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_power over a whole wind speed series.
+        
+        Args:
+            wind_speed: Wind speed in m/s
+            
+        Returns:
+            Power output in kW for every sample
+        """
+        power_kw = self._power_constant * wind_speed ** 3
+        
+        # Branch-free power curve, updated in place: cap at rated power, hold
+        # rated above rated speed, zero outside the cut-in/cut-out band
+        np.minimum(power_kw, self.rated_power, out=power_kw)
+        np.copyto(power_kw, self.rated_power, where=wind_speed >= self.rated_speed)
+        power_kw *= (wind_speed >= self.cut_in_speed) & (wind_speed <= self.cut_out_speed)
+        return power_kw
+    
     def get_tip_speed_ratio(self, wind_speed: float, rotor_speed: float) -> float:
         """
         Calculate tip speed ratio.
@@ -195,6 +269,32 @@ class BatteryStorage:
         
         return actual_power, self.soc
     
+    def dispatch(self, power_deficit: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run charge/discharge over a whole deficit series.
+        
+        Equivalent to calling discharge() for positive and charge() for
+        negative deficits step by step, but in a single compiled scan.
+        
+        Args:
+            power_deficit: Load minus generation in kW for every step
+            dt: Time step in hours
+            
+        Returns:
+            Tuple of (actual_power, soc) arrays
+        """
+        power_deficit = np.asarray(power_deficit, dtype=np.float64)
+        battery_power, battery_soc = _dispatch_battery(
+            power_deficit, float(self.soc), float(self.capacity),
+            float(self.max_charge_rate), float(self.max_discharge_rate),
+            float(self.efficiency), float(self.min_soc), float(self.max_soc), float(dt)
+        )
+        if len(battery_soc):
+            self.soc = battery_soc[-1]
+        self.cycle_count += np.count_nonzero(power_deficit > 0) * dt / 2
+        
+        return battery_power, battery_soc
+    
     def get_available_capacity(self) -> float:
         """
         Get available energy capacity.
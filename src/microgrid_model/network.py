@@ -68,6 +68,42 @@ class DCMicrogrid:
         for load_name, load_config in self.config['loads'].items():
             self.loads[load_name] = Load(load_config)
             self.logger.info(f"Load '{load_name}' initialized")
+        
+        # Load parameters as arrays so total demand is one dot product;
+        # the last result is kept since the bus voltage rarely changes.
+        # Both are rebuilt by _total_load whenever the loads change
+        self._load_parameters = None
+        self._load_power = self._load_exponent = None
+        self._load_voltage = None
+        self._load_total = 0.0
+    
+    def _total_load(self, voltage: float) -> float:
+        """
+        Total load demand at the given bus voltage.
+        
+        Same as summing Load.calculate_power over all loads.
+        
+        Args:
+            voltage: Bus voltage in V
+            
+        Returns:
+            Total load power in kW
+        """
+        # Loads may be added, removed or edited after construction, so
+        # their parameters are part of the cache key
+        parameters = [(load.power, load.voltage_dependency) for load in self.loads.values()]
+        if parameters != self._load_parameters:
+            self._load_parameters = parameters
+            self._load_power, self._load_exponent = (
+                np.array(parameters, dtype=np.float64).reshape(-1, 2).T
+            )
+            self._load_voltage = None
+        
+        if voltage != self._load_voltage:
+            voltage_ratio = voltage / self.voltage_level
+            self._load_total = float(self._load_power @ (voltage_ratio ** self._load_exponent))
+            self._load_voltage = voltage
+        return self._load_total
     
     def calculate_power_balance(
         self,
@@ -100,10 +136,7 @@ class DCMicrogrid:
         total_generation = pv_power + wind_power
         
         # Load demand
-        total_load = sum(
-            load.calculate_power(self.current_voltage, self.voltage_level)
-            for load in self.loads.values()
-        )
+        total_load = self._total_load(self.current_voltage)
         
         # Power balance
         power_deficit = total_load - total_generation
@@ -139,6 +172,72 @@ class DCMicrogrid:
             'power_deficit': power_deficit
         }
     
+    def batch_power_balance(
+        self,
+        irradiance: np.ndarray,
+        temperature: np.ndarray,
+        wind_speed: np.ndarray,
+        dt: float = 1.0
+    ) -> Dict:
+        """
+        Calculate power balance for a whole series of operating points.
+        
+        Same results as calling calculate_power_balance once per sample,
+        returned as one array per quantity instead of one dict per step.
+        
+        Args:
+            irradiance: Solar irradiance in W/m²
+            temperature: Temperature in °C
+            wind_speed: Wind speed in m/s
+            dt: Time step in hours
+            
+        Returns:
+            Dictionary of power balance arrays
+        """
+        n_steps = len(irradiance)
+        
+        # Generation
+        pv_power = np.zeros(n_steps)
+        if self.pv_system:
+            pv_power = self.pv_system.calculate_power_series(irradiance, temperature)
+        
+        wind_power = np.zeros(n_steps)
+        if self.wind_turbine:
+            wind_power = self.wind_turbine.calculate_power_series(wind_speed)
+        
+        total_generation = pv_power + wind_power
+        
+        # Load demand (bus voltage is constant over the batch)
+        total_load = np.full(n_steps, self._total_load(self.current_voltage))
+        
+        # Power balance
+        power_deficit = total_load - total_generation
+        
+        # Battery operation: the SOC recurrence is the only sequential part
+        battery_power = np.zeros(n_steps)
+        battery_soc = np.zeros(n_steps)
+        if self.battery:
+            battery_power, battery_soc = self.battery.dispatch(power_deficit, dt)
+        
+        # Calculate net power (positive = surplus, negative = deficit)
+        net_power = total_generation + battery_power - total_load
+        
+        # Update metrics
+        self.metrics['energy_generated'] += np.sum(total_generation, dtype=np.float64) * dt
+        self.metrics['energy_consumed'] += np.sum(total_load) * dt
+        
+        return {
+            'pv_power': pv_power,
+            'wind_power': wind_power,
+            'total_generation': total_generation,
+            'total_load': total_load,
+            'battery_power': battery_power,
+            'battery_soc': battery_soc,
+            'net_power': net_power,
+            'voltage': np.full(n_steps, self.current_voltage, dtype=np.float64),
+            'power_deficit': power_deficit
+        }
+    
     def check_system_stability(self, power_balance: Dict) -> Dict:
         """
         Check system stability and protection requirements.
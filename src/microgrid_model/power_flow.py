@@ -6,9 +6,49 @@ for DC microgrid systems.
 """
 
 import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
 from typing import Dict, List, Tuple
 import logging
 
+from ..utils.signal_processing import harmonic_distortion
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below also run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def _dense_newton(V, admittance_matrix, jacobian, power_injections,
+                  max_iterations, tolerance):
+    """Newton-Raphson loop of PowerFlowAnalyzer.calculate_dc_power_flow; updates V in place"""
+    # sum_j Y[i, j] * (V[i] - V[j]) == rowsum(Y)[i] * V[i] - (Y @ V)[i]
+    row_sum = admittance_matrix.sum(axis=1)
+    # The Jacobian is constant, so invert it once; iterations are then mat-vecs.
+    # Inversion waits for the first update, so an already balanced network
+    # converges even when its Jacobian is singular
+    jacobian_inv = np.empty_like(jacobian)
+    inverted = False
+
+    for iteration in range(max_iterations):
+        # Power mismatch
+        mismatch = power_injections - (row_sum * V - admittance_matrix @ V)
+
+        # Check convergence
+        if np.max(np.abs(mismatch)) < tolerance:
+            return V, iteration, True
+
+        if not inverted:
+            jacobian_inv = np.ascontiguousarray(np.linalg.inv(jacobian))
+            inverted = True
+
+        # Update voltages (simplified Newton-Raphson)
+        V += jacobian_inv @ mismatch
+
+    return V, max_iterations, False
+
 
 class PowerFlowAnalyzer:
     """DC Power Flow Analyzer"""
@@ -36,7 +76,7 @@ class PowerFlowAnalyzer:
         
         Args:
             voltages: Initial voltage guess
-            admittance_matrix: System admittance matrix
+            admittance_matrix: System admittance matrix, dense or scipy.sparse
             power_injections: Power injections at each bus
             max_iterations: Maximum iterations
             tolerance: Convergence tolerance
@@ -44,30 +84,137 @@ class PowerFlowAnalyzer:
         Returns:
             Tuple of (final voltages, convergence status)
         """
-        V = voltages.copy()
-        n_buses = len(V)
+        V = np.array(voltages, dtype=np.float64)
+        power_injections = np.asarray(power_injections, dtype=np.float64)
         
-        for iteration in range(max_iterations):
-            # Calculate power mismatch
-            P_calc = np.zeros(n_buses)
-            for i in range(n_buses):
-                for j in range(n_buses):
-                    P_calc[i] += admittance_matrix[i, j] * (V[i] - V[j])
+        if sparse.issparse(admittance_matrix):
+            V, iterations, converged = self._sparse_newton(
+                V, sparse.csr_array(admittance_matrix), power_injections,
+                max_iterations, tolerance
+            )
+        else:
+            admittance_matrix = np.ascontiguousarray(admittance_matrix, dtype=np.float64)
+            # The Jacobian only depends on Y, so build it once for all iterations
+            V, iterations, converged = _dense_newton(
+                V, admittance_matrix, self._calculate_jacobian(admittance_matrix, V),
+                power_injections, max_iterations, tolerance
+            )
+        
+        if converged:
+            self.logger.info(f"Power flow converged in {iterations} iterations")
+            return V, True
+        
+        self.logger.warning("Power flow did not converge")
+        return V, False
+    
+    def calculate_dc_power_flow_multiperiod(
+        self,
+        voltages: np.ndarray,
+        admittance_matrix: np.ndarray,
+        power_injections: np.ndarray,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate DC power flow for many time periods on the same network.
+        
+        Same results as calling calculate_dc_power_flow once per period,
+        but the Jacobian is built and factored once and every Newton step
+        updates all unconverged periods with one matrix solve.
+        
+        Args:
+            voltages: Initial voltage guess, (n_buses,) or (n_buses, n_periods)
+            admittance_matrix: System admittance matrix, dense or scipy.sparse
+            power_injections: Power injections, (n_buses, n_periods)
+            max_iterations: Maximum iterations
+            tolerance: Convergence tolerance
             
-            mismatch = power_injections - P_calc
+        Returns:
+            Tuple of (final voltages (n_buses, n_periods), convergence status per period)
+        """
+        P = np.asarray(power_injections, dtype=np.float64)
+        n_buses, n_periods = P.shape
+        V = np.empty_like(P)
+        V[:] = np.asarray(voltages, dtype=np.float64).reshape(n_buses, -1)
+        
+        if sparse.issparse(admittance_matrix):
+            admittance_matrix = sparse.csr_array(admittance_matrix)
+            row_sum = np.asarray(admittance_matrix.sum(axis=1)).ravel()
+        else:
+            admittance_matrix = np.asarray(admittance_matrix, dtype=np.float64)
+            row_sum = admittance_matrix.sum(axis=1)
+        
+        # Periods stop updating as soon as they converge, like the single solve.
+        # The Jacobian is only factored once some period needs an update
+        solve = None
+        active = np.ones(n_periods, dtype=bool)
+        for iteration in range(max_iterations):
+            V_active = V[:, active]
+            mismatch = P[:, active] - (row_sum[:, np.newaxis] * V_active - admittance_matrix @ V_active)
+            unconverged = ~(np.max(np.abs(mismatch), axis=0, initial=0.0) < tolerance)
+            active[active] = unconverged
+            if not active.any():
+                break
+            if solve is None:
+                solve = self._jacobian_solver(admittance_matrix, row_sum)
+            V[:, active] = V_active[:, unconverged] + solve(mismatch[:, unconverged])
+        
+        converged = ~active
+        if active.any():
+            self.logger.warning(
+                f"Power flow did not converge for {np.count_nonzero(active)} of {n_periods} periods"
+            )
+        else:
+            self.logger.info(f"Power flow converged for all {n_periods} periods")
+        return V, converged
+    
+    def _jacobian_solver(self, admittance_matrix, row_sum: np.ndarray):
+        """
+        Factor the constant Jacobian once and return a function applying
+        its inverse to a right-hand side (vector or one column per period).
+        
+        Args:
+            admittance_matrix: System admittance matrix, dense or CSR
+            row_sum: Row sums of the admittance matrix
             
-            # Check convergence
+        Returns:
+            Solve function
+        """
+        if sparse.issparse(admittance_matrix):
+            return splu(self._calculate_sparse_jacobian(admittance_matrix, row_sum)).solve
+        jacobian_inv = np.linalg.inv(self._calculate_jacobian(admittance_matrix, row_sum))
+        return lambda rhs: jacobian_inv @ rhs
+    
+    def _sparse_newton(
+        self,
+        V: np.ndarray,
+        admittance_matrix: sparse.csr_array,
+        power_injections: np.ndarray,
+        max_iterations: int,
+        tolerance: float
+    ) -> Tuple[np.ndarray, int, bool]:
+        """
+        Newton-Raphson loop for a sparse admittance matrix.
+        
+        Same iteration as ``_dense_newton``; the Jacobian is factored once
+        with ``splu`` and the factors are reused every iteration.
+        
+        Returns:
+            Tuple of (voltages, iterations, convergence status)
+        """
+        row_sum = np.asarray(admittance_matrix.sum(axis=1)).ravel()
+        # Factored on the first update, as in _dense_newton
+        jacobian_lu = None
+        
+        for iteration in range(max_iterations):
+            mismatch = power_injections - (row_sum * V - admittance_matrix @ V)
             if np.max(np.abs(mismatch)) < tolerance:
-                self.logger.info(f"Power flow converged in {iteration} iterations")
-                return V, True
-            
-            # Update voltages (simplified Newton-Raphson)
-            jacobian = self._calculate_jacobian(admittance_matrix, V)
-            delta_V = np.linalg.solve(jacobian, mismatch)
-            V += delta_V
+                return V, iteration, True
+            if jacobian_lu is None:
+                jacobian_lu = splu(self._calculate_sparse_jacobian(admittance_matrix, row_sum))
+            V += jacobian_lu.solve(mismatch)
         
-        self.logger.warning("Power flow did not converge")
-        return V, False
+        return V, max_iterations, False
     
     def _calculate_jacobian(
         self,
@@ -84,18 +231,30 @@ class PowerFlowAnalyzer:
         Returns:
             Jacobian matrix
         """
-        n = len(voltages)
-        jacobian = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    jacobian[i, j] = sum(admittance_matrix[i, :])
-                else:
-                    jacobian[i, j] = -admittance_matrix[i, j]
+        # -Y off the diagonal, row sums of Y on it
+        jacobian = -np.asarray(admittance_matrix, dtype=np.float64)
+        np.fill_diagonal(jacobian, np.sum(admittance_matrix, axis=1))
         
         return jacobian
     
+    @staticmethod
+    def _calculate_sparse_jacobian(
+        admittance_matrix: sparse.csr_array,
+        row_sum: np.ndarray
+    ) -> sparse.csc_array:
+        """
+        Sparse form of ``_calculate_jacobian``: -Y off the diagonal, row sums on it.
+        
+        Args:
+            admittance_matrix: System admittance matrix (CSR)
+            row_sum: Row sums of the admittance matrix
+            
+        Returns:
+            Jacobian matrix in CSC layout, ready for ``splu``
+        """
+        diagonal = sparse.diags(row_sum + admittance_matrix.diagonal())
+        return sparse.csc_array(diagonal - admittance_matrix)
+    
     def calculate_line_losses(
         self,
         voltages: np.ndarray,
@@ -106,27 +265,33 @@ class PowerFlowAnalyzer:
         
         Args:
             voltages: Voltage at each bus
-            admittance_matrix: System admittance matrix
+            admittance_matrix: System admittance matrix, dense or scipy.sparse
             
         Returns:
             Dictionary containing loss information
         """
-        n_buses = len(voltages)
-        total_losses = 0
-        line_losses = {}
+        # Lines are the nonzero entries above the diagonal
+        if sparse.issparse(admittance_matrix):
+            # Canonical CSR keeps the row-major line order of the dense path
+            upper = sparse.csr_array(sparse.triu(admittance_matrix, k=1))
+            upper.sum_duplicates()
+            upper.eliminate_zeros()
+            upper = upper.tocoo()
+            from_bus, to_bus, admittance = upper.row, upper.col, upper.data
+        else:
+            from_bus, to_bus = np.nonzero(np.triu(admittance_matrix, k=1))
+            admittance = admittance_matrix[from_bus, to_bus]
         
-        for i in range(n_buses):
-            for j in range(i + 1, n_buses):
-                if admittance_matrix[i, j] != 0:
-                    V_diff = voltages[i] - voltages[j]
-                    loss = admittance_matrix[i, j] * (V_diff ** 2)
-                    total_losses += loss
-                    line_losses[f"line_{i}_{j}"] = loss
+        losses = admittance * (voltages[from_bus] - voltages[to_bus]) ** 2
+        total_losses = losses.sum()
         
         return {
             'total_losses': total_losses,
-            'line_losses': line_losses,
-            'loss_percentage': (total_losses / sum(voltages ** 2)) * 100
+            'line_losses': {
+                f"line_{i}_{j}": loss
+                for i, j, loss in zip(from_bus.tolist(), to_bus.tolist(), losses.tolist())
+            },
+            'loss_percentage': (total_losses / np.dot(voltages, voltages)) * 100
         }
     
     def calculate_thd(self, signal: np.ndarray, fundamental_freq: float) -> float:
@@ -140,23 +305,8 @@ class PowerFlowAnalyzer:
         Returns:
             THD in percentage
         """
-        # FFT of signal
-        fft_signal = np.fft.fft(signal)
-        fft_magnitude = np.abs(fft_signal)
-        
-        # Fundamental component
-        fundamental = fft_magnitude[1]
-        
-        # Harmonic components
-        harmonics = fft_magnitude[2:20]  # Up to 20th harmonic
-        
-        # THD calculation
-        if fundamental == 0:
-            return 0
-        
-        thd = np.sqrt(np.sum(harmonics ** 2)) / fundamental * 100
-        
-        return thd
+        # Up to the 19th harmonic
+        return harmonic_distortion(signal, 19)
     
     def analyze_voltage_stability(
         self,
@@ -182,8 +332,11 @@ class PowerFlowAnalyzer:
         # Stability margin
         margin = 1.0 - max_deviation
         
-        # Voltage sensitivity
-        dV_dP = np.gradient(voltages) / np.gradient(power_injections)
+        # Voltage sensitivity; zero where the injections are flat (e.g. PV
+        # at night) instead of inf/nan
+        dV = np.gradient(voltages)
+        dP = np.gradient(power_injections)
+        dV_dP = np.divide(dV, dP, out=np.zeros_like(dV), where=np.abs(dP) > 1e-9)
         
         return {
             'voltage_pu': voltage_pu,
@@ -4,6 +4,7 @@ Data logging utilities
 
 import h5py
 import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Dict
@@ -32,8 +33,8 @@ class DataLogger:
         with h5py.File(filepath, 'w') as f:
             # Save time series data
             for key, value in results.items():
-                if isinstance(value, list):
-                    f.create_dataset(key, data=value)
+                if isinstance(value, (list, np.ndarray)):
+                    self._create_series(f, key, np.asarray(value))
             
             # Save metrics as attributes
             for key, value in metrics.items():
@@ -42,6 +43,44 @@ class DataLogger:
         
         self.logger.info(f"Results saved to {filepath}")
     
+    def append_results(self, results: Dict, filepath: str):
+        """
+        Append a block of timesteps to an HDF5 results file.
+        
+        Series are extended along their first axis, so long runs can be
+        streamed to disk instead of buffered in memory. The file and any
+        missing series are created on first use.
+        
+        Args:
+            results: Time series block, one entry per series
+            filepath: Output file path
+        """
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        
+        with h5py.File(filepath, 'a') as f:
+            for key, value in results.items():
+                if not isinstance(value, (list, np.ndarray)):
+                    continue
+                block = np.asarray(value)
+                if key not in f:
+                    self._create_series(f, key, block)
+                    continue
+                dataset = f[key]
+                start = dataset.shape[0]
+                dataset.resize(start + block.shape[0], axis=0)
+                dataset[start:] = block
+        
+        self.logger.debug(f"Appended results to {filepath}")
+    
+    @staticmethod
+    def _create_series(f: h5py.File, key: str, data: np.ndarray):
+        """Create a compressed series dataset that can grow along axis 0."""
+        # LZF with byte shuffling compresses the slowly varying signals
+        # well at close to memcpy speed
+        f.create_dataset(key, data=data, chunks=True,
+                         maxshape=(None,) + data.shape[1:],
+                         compression='lzf', shuffle=True)
+    
     def save_to_csv(self, results: Dict, filepath: str):
         """Save results to CSV file."""
         df = pd.DataFrame(results)
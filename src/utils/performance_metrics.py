@@ -5,6 +5,8 @@ Performance metrics calculation
 import numpy as np
 from typing import Dict
 
+from .signal_processing import harmonic_distortion
+
 
 class PerformanceMetrics:
     """Calculate various performance metrics for the microgrid"""
@@ -24,10 +26,12 @@ class PerformanceMetrics:
         dt = config['simulation']['output_interval'] / 3600  # hours
         
         # Energy metrics
+        # Accumulate in float64 even when the series are stored as float32
         total_generation = (
-            sum(results['pv_power']) + sum(results['wind_power'])
+            np.sum(results['pv_power'], dtype=np.float64)
+            + np.sum(results['wind_power'], dtype=np.float64)
         ) * dt
-        total_consumption = sum(results['total_load']) * dt
+        total_consumption = np.sum(results['total_load'], dtype=np.float64) * dt
         
         # Battery metrics
         avg_battery_soc = np.mean(results['battery_soc'])
@@ -42,9 +46,13 @@ class PerformanceMetrics:
         renewable_penetration = total_generation / total_consumption if total_consumption > 0 else 0
         
         # Voltage quality
-        voltage_pu = np.array(results['voltage']) / config['system']['voltage_level']
-        voltage_deviation = np.std(voltage_pu)
-        voltage_regulation = (np.max(voltage_pu) - np.min(voltage_pu)) / np.mean(voltage_pu) * 100
+        voltage_pu = np.asarray(results['voltage']) / config['system']['voltage_level']
+        voltage_mean = np.mean(voltage_pu)
+        voltage_regulation = np.ptp(voltage_pu) / voltage_mean * 100
+        # Same steps as np.std, reusing the mean and the voltage_pu buffer
+        voltage_pu -= voltage_mean
+        voltage_pu *= voltage_pu
+        voltage_deviation = np.sqrt(np.mean(voltage_pu))
         
         # Power quality
         thd = PerformanceMetrics._estimate_thd(results['net_power'])
@@ -73,8 +81,8 @@ class PerformanceMetrics:
             Number of equivalent cycles
         """
         # Simple cycle counting: sum of absolute SOC changes
-        soc_array = np.array(soc_data)
-        soc_changes = np.abs(np.diff(soc_array))
+        soc_changes = np.diff(np.asarray(soc_data))
+        np.abs(soc_changes, out=soc_changes)
         total_cycles = np.sum(soc_changes) / 2  # Full cycle = 2 half cycles
         
         return total_cycles
@@ -91,24 +99,12 @@ class PerformanceMetrics:
             Estimated THD percentage
         """
         # Simplified THD estimation using FFT
-        power_array = np.array(power_data)
+        power_array = np.asarray(power_data)
         
         if len(power_array) < 10:
             return 0.0
         
-        # FFT
-        fft_result = np.fft.fft(power_array)
-        fft_magnitude = np.abs(fft_result)
-        
-        # Fundamental (assume first harmonic)
-        fundamental = fft_magnitude[1]
-        
-        # Harmonics (2nd to 10th)
-        harmonics = fft_magnitude[2:11]
-        
-        if fundamental == 0:
-            return 0.0
-        
-        thd = np.sqrt(np.sum(harmonics**2)) / fundamental * 100
+        # Harmonics 2nd to 10th
+        thd = harmonic_distortion(power_array, 10)
         
         return min(thd, 100)  # Cap at 100%
@@ -0,0 +1,32 @@
+"""
+Signal processing helpers shared by the models and the metrics
+"""
+
+import numpy as np
+
+
+def harmonic_distortion(signal: np.ndarray, max_harmonic: int) -> float:
+    """
+    Total Harmonic Distortion of a sampled signal, taking FFT bin 1 as the
+    fundamental and bins 2..max_harmonic as its harmonics.
+    
+    Args:
+        signal: Time-domain signal
+        max_harmonic: Highest harmonic included
+        
+    Returns:
+        THD in percentage (0 when the fundamental is zero)
+    """
+    # FFT of real signal: rfft gives bins 0..N/2 and the bins above
+    # mirror them (|X[N-k]| == |X[k]|)
+    n_samples = len(signal)
+    fft_magnitude = np.abs(np.fft.rfft(signal))
+    
+    fundamental = fft_magnitude[1]
+    if fundamental == 0:
+        return 0.0
+    
+    harmonic_bins = np.arange(2, min(max_harmonic + 1, n_samples))
+    harmonics = fft_magnitude[np.minimum(harmonic_bins, n_samples - harmonic_bins)]
+    
+    return np.sqrt(np.sum(harmonics ** 2)) / fundamental * 100
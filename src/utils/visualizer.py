@@ -15,13 +15,15 @@ class Visualizer:
     def __init__(self, config: Dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        # PNG encoding dominates saving these 300 dpi plots
+        self.png_options = {'compress_level': config['simulation']['png_compress_level']}
         plt.style.use('seaborn-v0_8-darkgrid')
     
     def plot_power_balance(self, results: Dict, save_path: str = 'results/power_balance.png'):
         """Plot power generation and consumption."""
         fig, ax = plt.subplots(figsize=(12, 6))
         
-        time_hours = np.array(results['time']) / 3600
+        time_hours = np.asarray(results['time']) / 3600
         
         ax.plot(time_hours, results['pv_power'], label='PV Generation', linewidth=2)
         ax.plot(time_hours, results['wind_power'], label='Wind Generation', linewidth=2)
@@ -35,9 +37,9 @@ class Visualizer:
         ax.grid(True, alpha=0.3)
         
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight', pil_kwargs=self.png_options)
+        plt.close(fig)
         
         self.logger.info(f"Power balance plot saved to {save_path}")
     
@@ -45,10 +47,10 @@ class Visualizer:
         """Plot battery state of charge."""
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
         
-        time_hours = np.array(results['time']) / 3600
+        time_hours = np.asarray(results['time']) / 3600
         
         # SOC plot
-        ax1.plot(time_hours, np.array(results['battery_soc']) * 100, 
+        ax1.plot(time_hours, np.asarray(results['battery_soc']) * 100, 
                 linewidth=2, color='blue')
         ax1.axhline(y=20, color='r', linestyle='--', label='Min SOC (20%)')
         ax1.axhline(y=95, color='r', linestyle='--', label='Max SOC (95%)')  # Updated per documentation
@@ -66,9 +68,9 @@ class Visualizer:
         ax2.grid(True, alpha=0.3)
         
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight', pil_kwargs=self.png_options)
+        plt.close(fig)
         
         self.logger.info(f"Battery operation plot saved to {save_path}")
     
@@ -76,8 +78,8 @@ class Visualizer:
         """Plot voltage profile over time."""
         fig, ax = plt.subplots(figsize=(12, 6))
         
-        time_hours = np.array(results['time']) / 3600
-        voltage_pu = np.array(results['voltage']) / self.config['system']['voltage_level']
+        time_hours = np.asarray(results['time']) / 3600
+        voltage_pu = np.asarray(results['voltage']) / self.config['system']['voltage_level']
         
         ax.plot(time_hours, voltage_pu, linewidth=2, color='purple')
         ax.axhline(y=1.0, color='g', linestyle='--', label='Nominal Voltage')
@@ -91,9 +93,9 @@ class Visualizer:
         ax.grid(True, alpha=0.3)
         
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight', pil_kwargs=self.png_options)
+        plt.close(fig)
         
         self.logger.info(f"Voltage profile plot saved to {save_path}")
     
@@ -101,8 +103,8 @@ class Visualizer:
         """Plot renewable energy generation breakdown."""
         fig, ax = plt.subplots(figsize=(10, 6))
         
-        total_pv = sum(results['pv_power'])
-        total_wind = sum(results['wind_power'])
+        total_pv = np.sum(results['pv_power'], dtype=np.float64)
+        total_wind = np.sum(results['wind_power'], dtype=np.float64)
         
         labels = ['Solar PV', 'Wind Turbine']
         sizes = [total_pv, total_wind]
@@ -115,8 +117,8 @@ class Visualizer:
                     fontsize=14, fontweight='bold')
         
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight', pil_kwargs=self.png_options)
+        plt.close(fig)
         
         self.logger.info(f"Renewable generation plot saved to {save_path}")
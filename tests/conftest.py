@@ -0,0 +1,8 @@
+"""
+Test configuration: make the ``src`` package importable from the repository root.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
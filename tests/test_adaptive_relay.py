@@ -0,0 +1,79 @@
+"""
+Tests for Q-learning adaptive relay coordination
+"""
+
+import numpy as np
+import pytest
+
+from src.ai_protection.adaptive_relay import AdaptiveRelayCoordinator
+
+
+BUCKETS = [
+    np.linspace(0, 1.5, 10),
+    np.linspace(0, 2, 10),
+    np.linspace(0, 2, 10),
+    np.linspace(0, 1, 5),
+    np.linspace(0, 1, 3),
+    np.linspace(0, 1, 3),
+    np.linspace(0, 1, 6),
+    np.linspace(0, 1, 3),
+]
+
+
+def _digitize_key(state):
+    return sum(
+        int(np.digitize(value, bucket)) << (4 * k)
+        for k, (value, bucket) in enumerate(zip(state, BUCKETS))
+    )
+
+
+@pytest.fixture
+def coordinator():
+    return AdaptiveRelayCoordinator({'learning_rate': 0.5, 'discount_factor': 0.0})
+
+
+def test_confidence_follows_falling_q_values(coordinator):
+    state = coordinator.get_state({'voltage': 380, 'current': 50})
+    for _ in range(10):
+        coordinator.update_q_table(state, 2, 20.0, state)
+    for _ in range(10):
+        coordinator.update_q_table(state, 2, 1.0, state)
+    
+    decision = coordinator.coordinate_relays({}, {'voltage': 380, 'current': 50})
+    
+    assert decision['action_index'] == 2
+    assert decision['confidence'] == pytest.approx(1.0)
+    assert coordinator._q_global_max == pytest.approx(
+        max(row.max() for row in coordinator.q_table.values())
+    )
+
+
+def test_discretize_state_matches_digitize_on_bucket_edges(coordinator):
+    edges = np.concatenate(BUCKETS)
+    candidates = np.concatenate([
+        edges,
+        np.nextafter(edges, -np.inf),
+        np.nextafter(edges, np.inf),
+        [-1.0, 2.5, 100.0],
+    ])
+    rng = np.random.default_rng(0)
+    
+    for _ in range(2000):
+        state = rng.choice(candidates, len(BUCKETS))
+        assert coordinator.discretize_state(state) == _digitize_key(state)
+
+
+def test_discretize_state_matches_digitize_for_nan(coordinator):
+    state = coordinator.get_state({'voltage': 380, 'current': float('nan')})
+    
+    assert coordinator.discretize_state(state) == _digitize_key(state)
+    # A NaN reading must not break relay coordination
+    coordinator.coordinate_relays({}, {'voltage': 380, 'current': float('nan')})
+
+
+@pytest.mark.parametrize('value', [np.inf, -np.inf])
+def test_discretize_state_matches_digitize_for_inf(coordinator, value):
+    for feature in range(8):
+        state = np.full(8, 0.5)
+        state[feature] = value
+        assert coordinator.discretize_state(state) == _digitize_key(state)
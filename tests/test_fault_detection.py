@@ -0,0 +1,120 @@
+"""
+Tests for the AI-based fault detector
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.ai_protection.fault_detection import FaultDetector
+
+
+@pytest.fixture
+def detector():
+    np.random.seed(42)
+    return FaultDetector({})
+
+
+def _random_windows(n_windows, seed=0):
+    """Voltage/current/power windows spanning normal and faulted operation."""
+    rng = np.random.default_rng(seed)
+    level = rng.uniform(0.0, 3.0, (n_windows, 1, 3))
+    spread = rng.uniform(0.0, 0.2, (n_windows, 1, 3))
+    return level + spread * rng.standard_normal((n_windows, 100, 3))
+
+
+def test_batch_decisions_match_sklearn_at_threshold(detector):
+    windows = _random_windows(5000)
+    features = detector._window_features(windows)
+    probabilities = detector.model.predict_proba(features)
+    fault_idx = probabilities.argmax(axis=1)
+    confidence = probabilities.max(axis=1)
+    
+    # Thresholds equal to confidences the forest actually produces put
+    # windows exactly on the decision boundary
+    thresholds = np.unique(confidence[fault_idx != 0])
+    for threshold in thresholds[:: max(1, len(thresholds) // 25)]:
+        detector.confidence_threshold = threshold
+        result = detector.detect_fault_batch(windows)
+        
+        np.testing.assert_array_equal(
+            result['fault_detected'], (fault_idx != 0) & (confidence >= threshold)
+        )
+        np.testing.assert_array_equal(
+            result['fault_type'], np.array(detector.fault_types, dtype=object)[fault_idx]
+        )
+
+
+def test_single_window_decision_matches_batch(detector):
+    windows = _random_windows(50, seed=1)
+    batch = detector.detect_fault_batch(windows)
+    
+    for i, window in enumerate(windows):
+        result = detector.detect_fault(window)
+        assert result['fault_detected'] == batch['fault_detected'][i]
+        assert result['fault_type'] == batch['fault_type'][i]
+
+
+def _legacy_training_set(seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(0.0, 3.0, 600),
+        rng.uniform(0.0, 0.2, 600),
+        rng.uniform(0.5, 1.1, 600),
+        rng.uniform(0.0, 0.1, 600),
+    ])
+    y = (X[:, 0] > 1.5).astype(int) + (X[:, 0] < 0.5).astype(int) * 2
+    return X, y
+
+
+@pytest.mark.parametrize('scaler', [
+    StandardScaler(),  # saved before any detection
+    StandardScaler().fit([[1.0, 0.02, 0.8, 0.05]]),  # refitted by detect_fault
+], ids=['unfitted', 'single-row'])
+def test_load_baseline_model_ignores_unused_scaler(detector, tmp_path, scaler):
+    # The default model was trained on raw features; its scaler never was
+    X, y = _legacy_training_set()
+    model = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0).fit(X, y)
+    thresholds = [estimator.tree_.threshold.copy() for estimator in model.estimators_]
+    filepath = tmp_path / 'baseline.joblib'
+    joblib.dump({'model': model, 'scaler': scaler}, filepath)
+    
+    detector.load_model(str(filepath))
+    
+    for estimator, expected in zip(detector.model.estimators_, thresholds):
+        np.testing.assert_array_equal(estimator.tree_.threshold, expected)
+    np.testing.assert_array_equal(
+        detector._predict_proba(X).argmax(axis=1), model.predict_proba(X).argmax(axis=1)
+    )
+
+
+def test_load_trained_model_folds_scaler(detector, tmp_path):
+    # train() fitted the scaler on the training set and trained on its output
+    X, y = _legacy_training_set()
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0)
+    model.fit(scaler.transform(X), y)
+    expected = model.predict(scaler.transform(X))
+    filepath = tmp_path / 'trained.joblib'
+    joblib.dump({'model': model, 'scaler': scaler}, filepath)
+    
+    detector.load_model(str(filepath))
+    
+    np.testing.assert_array_equal(detector._predict_proba(X).argmax(axis=1), expected)
+
+
+def test_single_window_decision_follows_threshold_changes(detector):
+    windows = _random_windows(200, seed=2)
+    batch = detector.detect_fault_batch(windows)
+    
+    # Repeated calls on one window hit the cache; moving the threshold onto
+    # the window's confidence must still give the batch decision
+    for i in np.flatnonzero(batch['fault_type'] != 'no_fault')[:5]:
+        for threshold in (0.0, batch['confidence'][i], 1.0):
+            detector.confidence_threshold = threshold
+            result = detector.detect_fault(windows[i])
+            expected = detector.detect_fault_batch(windows[i:i + 1])
+            assert result['fault_detected'] == expected['fault_detected'][0]
+            assert result['confidence'] == expected['confidence'][0]
@@ -0,0 +1,39 @@
+"""
+Tests for the DC microgrid network model
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.microgrid_model.components import Load
+from src.microgrid_model.network import DCMicrogrid
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config' / 'microgrid_config.yaml'
+
+
+@pytest.fixture
+def microgrid():
+    with open(CONFIG_PATH) as f:
+        return DCMicrogrid(yaml.safe_load(f))
+
+
+def _expected_load(microgrid, voltage):
+    return sum(
+        load.calculate_power(voltage, microgrid.voltage_level)
+        for load in microgrid.loads.values()
+    )
+
+
+def test_total_load_follows_load_changes(microgrid):
+    assert microgrid._total_load(390) == pytest.approx(_expected_load(microgrid, 390))
+    
+    microgrid.loads['extra'] = Load({'power': 10})
+    assert microgrid._total_load(390) == pytest.approx(_expected_load(microgrid, 390))
+    
+    microgrid.loads['extra'].power = 20
+    assert microgrid._total_load(390) == pytest.approx(_expected_load(microgrid, 390))
+    
+    microgrid.loads.clear()
+    assert microgrid._total_load(390) == 0.0
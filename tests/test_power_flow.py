@@ -0,0 +1,74 @@
+"""
+Tests for DC power flow analysis
+"""
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.microgrid_model.power_flow import PowerFlowAnalyzer
+
+
+# Balanced network whose Jacobian (row sums on the diagonal, -Y off it)
+# is singular: no update is ever needed, so no solve may be attempted
+SINGULAR_ADMITTANCE = np.array([
+    [0.0, 2.0, 0.0],
+    [2.0, 0.0, 1.0],
+    [0.0, 1.0, 0.0],
+])
+
+
+@pytest.fixture
+def analyzer():
+    return PowerFlowAnalyzer(voltage_base=400)
+
+
+def test_balanced_network_with_singular_jacobian_converges(analyzer):
+    V, converged = analyzer.calculate_dc_power_flow(
+        np.full(3, 400.0), SINGULAR_ADMITTANCE, np.zeros(3)
+    )
+    
+    assert converged
+    np.testing.assert_array_equal(V, 400.0)
+
+
+def test_sparse_balanced_network_with_singular_jacobian_converges(analyzer):
+    V, converged = analyzer.calculate_dc_power_flow(
+        np.full(3, 400.0), sparse.csr_array(SINGULAR_ADMITTANCE), np.zeros(3)
+    )
+    
+    assert converged
+    np.testing.assert_array_equal(V, 400.0)
+
+
+@pytest.mark.parametrize('admittance', [SINGULAR_ADMITTANCE, sparse.csr_array(SINGULAR_ADMITTANCE)])
+def test_multiperiod_balanced_periods_skip_factorization(analyzer, admittance):
+    V, converged = analyzer.calculate_dc_power_flow_multiperiod(
+        np.full(3, 400.0), admittance, np.zeros((3, 4))
+    )
+    
+    assert converged.all()
+    np.testing.assert_array_equal(V, 400.0)
+
+
+def test_multiperiod_matches_single_period_solves(analyzer):
+    rng = np.random.default_rng(0)
+    n_buses, n_periods = 6, 5
+    admittance = np.zeros((n_buses, n_buses))
+    for i in range(1, n_buses):
+        admittance[i, i - 1] = admittance[i - 1, i] = rng.uniform(5, 10)
+    admittance += np.diag(np.full(n_buses, 0.5))
+    P = rng.normal(size=(n_buses, n_periods))
+    P -= P.mean(axis=0)
+    
+    V, converged = analyzer.calculate_dc_power_flow_multiperiod(
+        np.full(n_buses, 400.0), admittance, P
+    )
+    
+    assert converged.all()
+    for t in range(n_periods):
+        V_t, converged_t = analyzer.calculate_dc_power_flow(
+            np.full(n_buses, 400.0), admittance, P[:, t]
+        )
+        assert converged[t] == converged_t
+        np.testing.assert_allclose(V[:, t], V_t, rtol=0, atol=1e-9)